@@ -6,41 +6,168 @@ that tell the story in a visual and engaging way.
 """
 
 import os
-import json
+import asyncio
+import re
+import uuid
+from functools import lru_cache
+from hashlib import sha256
 from pathlib import Path
 from datetime import datetime
-from typing import Annotated, Any, Dict, List, Tuple, TypedDict, Literal
+from typing import Annotated, Any, Callable, Dict, List, Optional, Tuple, TypedDict, Literal
 
 from langgraph.graph import END, StateGraph, START
+from langgraph.graph.message import add_messages
 from langgraph.prebuilt import ToolNode, create_react_agent
-from langgraph.checkpoint.memory import InMemorySaver
+from langgraph.cache.memory import InMemoryCache
+from langgraph.config import get_stream_writer
+from langgraph.types import CachePolicy
 
 import openai
 from openai import OpenAI
 from langchain_openai import ChatOpenAI
+from langchain_core.messages import AnyMessage
+from langchain_core.exceptions import OutputParserException
+from pydantic import ValidationError
+from tenacity import retry, retry_if_exception_type, stop_after_attempt
 
-from tools.image_tools import image_tool_node, bulk_generate_images
-from tools.story_tools import story_tool_node
+from services.analysis_cache import SemanticAnalysisCache
+from services.sqlite_checkpointer import create_sqlite_checkpointer
+from tools.image_tools import BulkGenerateImagesInput, bulk_generate_images, get_image_service
+from tools.story_tools import MemePromptList
 
 
-# Define the agent state
+def merge_dicts(left: Dict[str, Any] | None, right: Dict[str, Any] | None) -> Dict[str, Any]:
+    """
+    Reducer that merges a node's metadata update into the existing metadata.
+    
+    Args:
+        left: The current metadata
+        right: The keys returned by a node
+    
+    Returns:
+        Merged metadata, with the node's values taking precedence
+    """
+    return {**(left or {}), **(right or {})}
+
+
+# Define the agent state. Nodes return only the keys they change; messages are
+# appended and metadata is merged by the reducers instead of copied by each node.
 class AgentState(TypedDict):
     # The original story to be converted into memes
     story: str
     # The current messages in the conversation
-    messages: List[Dict[str, Any]]
+    messages: Annotated[List[AnyMessage], add_messages]
     # The meme prompts extracted from the story
     meme_prompts: List[str]
     # Paths to the generated meme images
     image_paths: List[str]
     # Additional metadata about the generation process
-    metadata: Dict[str, Any]
+    metadata: Annotated[Dict[str, Any], merge_dicts]
     # Status of the current task
     status: Literal["in_progress", "complete", "error"]
     # Optional error message if something went wrong
     error: str | None
 
 
+# Static instructions for the story analysis, kept as the leading system message
+# with no interpolated values so every request shares an identical prefix. At
+# roughly 350 tokens it is below the 1024-token minimum for OpenAI's automatic
+# prompt caching, so it is not cached today; staying static keeps it eligible if
+# the instructions grow past that threshold.
+SYSTEM_PROMPT = """
+    You are a creative meme generator assistant. Your task is to analyze stories
+    and convert them into engaging visual memes. Each meme should include a short
+    caption (15-20 words maximum) that helps tell the story in a funny and
+    insightful way. The sequence of memes should capture the overall narrative
+    arc of the story.
+    
+    Guidelines for creating good meme prompts:
+    1. Each prompt should be specific and detailed about the visual scene
+    2. Include style specification (e.g., 'pixar style', 'photorealistic')
+    3. Mention any text that should appear on the meme
+    4. Make sure the sequence flows well and tells a coherent story
+    
+    Please analyze the story provided by the user and break it down into 9 key
+    narrative points that would make good meme images. For each point:
+    1. Identify the key moment, character interaction, or plot development
+    2. Suggest a visual scene that captures this moment
+    3. Create a short, funny caption (15-20 words maximum) that is moving and insightful
+    4. Include style specification (e.g., 'pixar style', 'photorealistic')
+    5. Mention any text that should appear on the meme
+    6. Make sure the sequence flows well and tells a coherent story
+    
+    Respond with a JSON structure that contains an array of exactly 9 meme prompts.
+    Each prompt should have a detailed visual description ("visual") and the text
+    to appear on the meme ("caption").
+    Format each prompt to work well with the OpenAI image generation API.
+"""
+
+# How long a cached story analysis stays valid, in seconds
+ANALYSIS_CACHE_TTL = 3600
+
+# The chat model that analyzes stories, and the number of memes SYSTEM_PROMPT asks it for
+ANALYSIS_MODEL = "gpt-4o"
+NUM_MEME_PROMPTS = 9
+
+
+class StoryAnalysisError(Exception):
+    """
+    Raised by analyze_story when no meme prompts could be produced.
+    
+    The node raises instead of returning an error state because its result is
+    node-cached, and a cached failure would be replayed for every rerun of the story.
+    """
+
+
+@lru_cache(maxsize=1)
+def get_analysis_cache() -> SemanticAnalysisCache:
+    """
+    Get the shared semantic cache of story analyses, loading it on first use.
+    
+    Returns:
+        The process-wide SemanticAnalysisCache
+    """
+    # Analyses from another model or other instructions are not reused
+    version = sha256(f"{ANALYSIS_MODEL}\n{SYSTEM_PROMPT}".encode("utf-8")).hexdigest()[:16]
+    return SemanticAnalysisCache(version=version)
+
+
+@lru_cache(maxsize=1)
+def get_analysis_model():
+    """
+    Get the shared story analysis model, constructing it on first use.
+    
+    Building ChatOpenAI reads the environment and sets up HTTP clients, so it is
+    done once per process and the connection pool is reused across runs.
+    
+    Returns:
+        GPT-4o runnable bound to the MemePromptList output schema
+    """
+    return ChatOpenAI(model=ANALYSIS_MODEL).with_structured_output(MemePromptList)
+
+
+@retry(
+    stop=stop_after_attempt(2),
+    retry=retry_if_exception_type((OutputParserException, ValidationError)),
+    reraise=True
+)
+def request_meme_prompts(messages: List[Any]) -> MemePromptList:
+    """
+    Ask the analysis model for the story's meme prompts.
+    
+    A malformed structured response is retried once before giving up, so a bad
+    parse costs at most one extra chat completion instead of wasting image quota
+    on placeholder prompts.
+    
+    Args:
+        messages: The conversation to send to the model
+    
+    Returns:
+        The validated meme prompts
+    """
+    return get_analysis_model().invoke(messages)
+
+
 # Define the initial state creator
 def create_initial_state(story: str) -> AgentState:
     """
@@ -58,33 +185,37 @@ def create_initial_state(story: str) -> AgentState:
         "story": story,
         "messages": [{
             "role": "system",
-            "content": """
-                You are a creative meme generator assistant. Your task is to analyze stories
-                and convert them into engaging visual memes. Each meme should include a short
-                caption (15-20 words maximum) that helps tell the story in a funny and
-                insightful way. The sequence of memes should capture the overall narrative
-                arc of the story.
-                
-                Guidelines for creating good meme prompts:
-                1. Each prompt should be specific and detailed about the visual scene
-                2. Include style specification (e.g., 'pixar style', 'photorealistic')
-                3. Mention any text that should appear on the meme
-                4. Make sure the sequence flows well and tells a coherent story
-            """
+            "content": SYSTEM_PROMPT
         }],
         "meme_prompts": [],
         "image_paths": [],
         "metadata": {
             "start_time": current_time,
-            "story_length": len(story.split()),
+            # Count whitespace-separated words without building a list of them
+            "story_length": sum(1 for _ in re.finditer(r"\S+", story)),
         },
         "status": "in_progress",
         "error": None
     }
 
 
+def format_prompt(visual: str, caption: str) -> str:
+    """
+    Format a meme's visual description and caption for image generation.
+    
+    Args:
+        visual: Description of the visual scene
+        caption: Text caption to appear on the meme
+    
+    Returns:
+        Prompt for the image generation API
+    """
+    # Kept to a single terse line: the image API bills every prompt token
+    return f'Cartoon meme, vibrant, humorous. Scene: {visual}. Caption text on image: "{caption}"'
+
+
 # Define the nodes for our agent graph
-def analyze_story(state: AgentState) -> AgentState:
+def analyze_story(state: AgentState) -> Dict[str, Any]:
     """
     Analyze the story and break it down into key narrative points.
     
@@ -92,94 +223,51 @@ def analyze_story(state: AgentState) -> AgentState:
         state: Current agent state
     
     Returns:
-        Updated agent state with analysis
+        State update with the meme prompts and analysis metadata
+    
+    Raises:
+        StoryAnalysisError: If the model call fails or its response cannot be parsed.
     """
-    model = ChatOpenAI(model="gpt-4o")
-    
-    # Add messages to instruct the model to analyze the story
-    messages = state["messages"] + [{
-        "role": "user",
-        "content": f"""
-            Please analyze the following story and break it down into 9 key narrative points
-            that would make good meme images. For each point:
-            1. Identify the key moment, character interaction, or plot development
-            2. Suggest a visual scene that captures this moment
-            3. Create a short, funny caption (15-20 words maximum) that is moving and insightful
-            4. Include style specification (e.g., 'pixar style', 'photorealistic')
-            5. Mention any text that should appear on the meme
-            6. Make sure the sequence flows well and tells a coherent story
-            
-            Story:
-            {state['story']}
-            
-            Respond with a JSON structure that contains an array of exactly 9 meme prompts.
-            Each prompt should have a detailed visual description and the text to appear on the meme.
-            Format each prompt to work well with the OpenAI image generation API.
-        """
-    }]
-    
-    # Get the model response
-    response = model.invoke(messages)
-    
-    # Extract the meme prompts from the response
-    response_content = response.content
-    
-    # Try to parse the JSON from the response
+    # Reuse the memes of a near-identical story if we have analyzed one before.
+    # The cache is an optimization only, so embedding failures fall through to the model.
+    analysis_cache = get_analysis_cache()
     try:
-        # Look for JSON-like structure in the response
-        start_idx = response_content.find("[{\"")
-        if start_idx == -1:
-            start_idx = response_content.find("[{\n")
-        if start_idx == -1:
-            start_idx = response_content.find("[")
-            
-        end_idx = response_content.rfind("]")
-        if start_idx >= 0 and end_idx > start_idx:
-            json_content = response_content[start_idx:end_idx + 1]
-            meme_data = json.loads(json_content)
-            meme_prompts = []
-            
-            for meme in meme_data:
-                # Extract visual description and caption
-                visual = meme.get("visual", "")
-                caption = meme.get("caption", "")
-                
-                # Format the prompt for image generation
-                prompt = f"""
-                Create a meme image with the following scene: {visual}
-                
-                The image should include the following text caption:
-                \"{caption}\"
-                
-                Style: Cartoon meme style, vibrant colors, modern, humorous
-                """
-                meme_prompts.append(prompt)
-        else:
-            # Fallback: Try to extract 9 sections from the text
-            parts = response_content.split("\n\n")
-            meme_prompts = []
-            for part in parts:
-                if len(meme_prompts) >= 9:
-                    break
-                if len(part.strip()) > 20:  # Ensure it's substantive
-                    meme_prompts.append(part)
-            
-            # If we don't have 9 prompts, fill with placeholders
-            while len(meme_prompts) < 9:
-                meme_prompts.append(f"Generic meme scene {len(meme_prompts) + 1}")
-    
-    except Exception as e:
-        # If JSON parsing fails, update state with error
-        return {
-            **state,
-            "status": "error",
-            "error": f"Failed to parse meme prompts from model response: {str(e)}"
-        }
+        story_vector = analysis_cache.embed(state["story"])
+        cached_pairs = analysis_cache.lookup(story_vector)
+    except Exception:
+        story_vector, cached_pairs = None, None
+    
+    if cached_pairs is not None:
+        meme_pairs = cached_pairs
+    else:
+        # Add the story as the user turn. It carries only the dynamic story text; all
+        # instructions live in the static system prompt so the request prefix stays identical
+        messages = state["messages"] + [{
+            "role": "user",
+            "content": f"Story:\n{state['story']}"
+        }]
+        
+        # Get the model response as a validated MemePromptList
+        try:
+            response = request_meme_prompts(messages)
+        except (OutputParserException, ValidationError) as e:
+            raise StoryAnalysisError(f"Failed to parse meme prompts from model response: {str(e)}") from e
+        except Exception as e:
+            # Network, auth and other API failures
+            raise StoryAnalysisError(f"Story analysis request failed: {str(e)}") from e
+        
+        meme_pairs = [(p.visual, p.caption) for p in response.prompts]
+        
+        # Only cache complete analyses; a short one would be replayed for every similar story
+        if story_vector is not None and len(meme_pairs) == NUM_MEME_PROMPTS:
+            analysis_cache.add(story_vector, meme_pairs)
+    
+    # Formatted on every run, so prompt template changes also apply to cached analyses
+    meme_prompts = [format_prompt(visual, caption) for visual, caption in meme_pairs]
     
     # Update state with the extracted meme prompts
-    updated_state = {
-        **state,
-        "messages": state["messages"] + [{
+    return {
+        "messages": [{
             "role": "user",
             "content": "Please analyze this story and create 9 meme prompts."
         }, {
@@ -188,127 +276,66 @@ def analyze_story(state: AgentState) -> AgentState:
         }],
         "meme_prompts": meme_prompts,
         "metadata": {
-            **state["metadata"],
             "analysis_complete": True,
+            "analysis_cache_hit": cached_pairs is not None,
             "num_prompts": len(meme_prompts)
         }
     }
-    
-    return updated_state
 
 
-def generate_meme_images(state: AgentState) -> Dict[str, Any]:
+async def generate_meme_images(state: AgentState) -> Dict[str, Any]:
     """
     Generate meme images based on the analyzed prompts.
-    This node connects to the image_tool_node.
+    Calls the bulk image generation tool directly and records the results.
     
     Args:
         state: Current agent state with meme prompts
     
     Returns:
-        Updated state with messages formatted for the ToolNode
+        State update with image paths and completion metadata
     """
     # Check if we have meme prompts
     if not state["meme_prompts"]:
         return {
-            "__end__": {
-                **state,
-                "status": "error",
-                "error": "No meme prompts were generated from the story analysis."
-            }
+            "status": "error",
+            "error": "No meme prompts were generated from the story analysis."
         }
     
-    # Import necessary modules for AIMessage with tool calls
-    from langchain_core.messages import AIMessage, ToolCall
-    
-    # Create a tool call for bulk_generate_images
-    tool_call = ToolCall(
-        id=f"call_{datetime.now().strftime('%Y%m%d%H%M%S')}",
-        name="bulk_generate_images",
-        args={
-            "input_data": {
-                "prompts": state["meme_prompts"],
-                "model": "gpt-image-1",
-                "output_dir": None  # Use the default timestamped directory
-            }
-        }
-    )
+    # Forward each finished image to the stream as soon as it is written
+    writer = get_stream_writer()
     
-    # Create an AIMessage with the tool call
-    ai_message = AIMessage(
-        content="I'll generate meme images based on these prompts.",
-        tool_calls=[tool_call]
+    result = await bulk_generate_images(
+        BulkGenerateImagesInput(
+            prompts=state["meme_prompts"],
+            model="gpt-image-1",
+            output_dir=None  # Use the default timestamped directory
+        ),
+        on_result=lambda image_result: writer({"image_result": image_result})
     )
     
-    # Update the state with messages formatted for ToolNode
-    return {
-        **state,
-        "messages": state["messages"] + [ai_message]
-    }
-
-
-def process_image_results(state: AgentState, tool_messages: List[Any]) -> AgentState:
-    """
-    Process the results from the image generation.
-    
-    Args:
-        state: Current agent state
-        tool_messages: Tool messages returned from the ToolNode
-    
-    Returns:
-        Updated agent state with image paths
-    """
-    # Extract result from tool messages
-    if not tool_messages or len(tool_messages) == 0:
+    # Check if image generation was successful
+    if not result.get("success"):
         return {
-            **state,
             "status": "error",
-            "error": "No response received from image generation tool"
+            "error": f"Failed to generate images: {result.get('error', 'Unknown error')}"
         }
     
-    # Parse the content of the tool message
-    # The ToolNode returns a list of ToolMessages, but we only have one tool call
-    tool_message = tool_messages[0]
-    try:
-        # Convert the message content to a dictionary
-        import json
-        result = json.loads(tool_message.content)
-        
-        # Check if image generation was successful
-        if not result.get("success"):
-            return {
-                **state,
-                "status": "error",
-                "error": f"Failed to generate images: {result.get('error', 'Unknown error')}"
-            }
-        
-        # Extract the successful image paths
-        image_paths = result.get("output_paths", [])
-        session_dir = result.get("session_dir")
-    except (json.JSONDecodeError, AttributeError) as e:
-        return {
-            **state,
-            "status": "error",
-            "error": f"Failed to parse tool response: {str(e)}"
-        }
+    # Extract the successful image paths
+    image_paths = result.get("output_paths", [])
     
     # Update state with the generated image paths
-    updated_state = {
-        **state,
+    return {
         "image_paths": image_paths,
         "metadata": {
-            **state["metadata"],
-            "session_dir": session_dir,
+            "session_dir": result.get("session_dir"),
             "images_generated": len(image_paths),
             "completion_time": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
         },
         "status": "complete"
     }
-    
-    return updated_state
 
 
-def handle_error(state: AgentState) -> AgentState:
+def handle_error(state: AgentState) -> Dict[str, Any]:
     """
     Handle any errors in the agent workflow.
     
@@ -316,18 +343,32 @@ def handle_error(state: AgentState) -> AgentState:
         state: Current agent state with error
     
     Returns:
-        Final agent state with error information
+        State update with error information
     """
     return {
-        **state,
         "status": "error",
         "metadata": {
-            **state["metadata"],
             "error_time": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
         }
     }
 
 
+def story_cache_key(state: AgentState) -> str:
+    """
+    Build the cache key for the analyze_story node.
+    
+    Only the story text participates in the key; messages and metadata carry
+    timestamps that would otherwise make every run a cache miss.
+    
+    Args:
+        state: Current agent state
+    
+    Returns:
+        Hex digest identifying the story
+    """
+    return sha256(state["story"].encode("utf-8")).hexdigest()
+
+
 # Create the agent workflow
 def create_meme_generator_agent():
     """
@@ -336,102 +377,103 @@ def create_meme_generator_agent():
     Returns:
         Compiled state graph for the meme generator agent
     """
-    # Create an in-memory saver for checkpoints
-    checkpointer = InMemorySaver()
+    # Persist checkpoints to SQLite (WAL mode) so they are shared across processes
+    checkpointer = create_sqlite_checkpointer()
     
     # Create the state graph
     workflow = StateGraph(AgentState)
     
-    # Add nodes
-    workflow.add_node("analyze_story", analyze_story)
+    # Add nodes. The story analysis is cached so re-running the same story
+    # skips the LLM call entirely.
+    workflow.add_node(
+        "analyze_story",
+        analyze_story,
+        cache_policy=CachePolicy(key_func=story_cache_key, ttl=ANALYSIS_CACHE_TTL)
+    )
     workflow.add_node("generate_meme_images", generate_meme_images)
-    
-    # Add process_image_results with proper mapping for the tool_messages parameter
-    def process_image_results_mapping(state, messages=None):
-        # This function maps the state and tool messages to the process_image_results function
-        # Check if messages is None (happens when ToolNode returns messages in the state)
-        if messages is None and "messages" in state:
-            # Find tool messages in the state - they're usually the last messages
-            # that were added by the ToolNode
-            tool_messages = [
-                msg for msg in state["messages"] 
-                if hasattr(msg, "name") and msg.name == "bulk_generate_images"
-            ]
-            return process_image_results(state, tool_messages)
-        elif messages is None:
-            # If no messages found, pass an empty list
-            return process_image_results(state, [])
-        else:
-            # If messages were passed directly, use them
-            return process_image_results(state, messages)
-    workflow.add_node("process_image_results", process_image_results_mapping)
-    
     workflow.add_node("handle_error", handle_error)
     
-    # Add the tool node for image generation
-    workflow.add_node("image_tools", image_tool_node)
-    
     # Define edges
     workflow.add_edge(START, "analyze_story")
-    workflow.add_edge("analyze_story", "generate_meme_images")
-    workflow.add_edge("generate_meme_images", "image_tools")
-    workflow.add_edge("image_tools", "process_image_results")
-    workflow.add_edge("process_image_results", END)
     
-    # Add error handling
-    workflow.add_conditional_edges(
-        "analyze_story",
-        lambda state: "handle_error" if state.get("error") else "generate_meme_images"
-    )
+    # A failed analysis raises out of the graph (see StoryAnalysisError), so only
+    # successful analyses reach the node cache and the image generation step
+    workflow.add_edge("analyze_story", "generate_meme_images")
     
-    # Add conditional edge for potential errors in process_image_results
+    # Add conditional edge for potential errors in generate_meme_images
     workflow.add_conditional_edges(
-        "process_image_results",
+        "generate_meme_images",
         lambda state: "handle_error" if state.get("error") else END
     )
     
     workflow.add_edge("handle_error", END)
     
-    # Compile the graph with the checkpointer
-    return workflow.compile(checkpointer=checkpointer)
+    # Compile the graph with the checkpointer and node cache
+    return workflow.compile(checkpointer=checkpointer, cache=InMemoryCache())
 
 
-# Main function to run the agent
-def generate_memes_from_story(story: str) -> Dict[str, Any]:
+@lru_cache(maxsize=1)
+def get_meme_generator_agent():
     """
-    Generate a sequence of memes from a story.
+    Get the shared compiled meme generator agent, building it on first use.
+    
+    The checkpointer and node cache are shared by every run; runs are kept apart
+    by their unique thread_id.
+    
+    Returns:
+        Compiled state graph for the meme generator agent
+    """
+    return create_meme_generator_agent()
+
+
+# Main functions to run the agent
+async def agenerate_memes_from_story(story: str,
+                                     on_image: Optional[Callable[[Dict[str, Any]], None]] = None) -> Dict[str, Any]:
+    """
+    Asynchronously generate a sequence of memes from a story.
+    
+    Several stories can be processed concurrently on one event loop, e.g. with
+    asyncio.gather over multiple calls.
     
     Args:
         story: The story to convert into memes
+        on_image: Optional callback invoked with each image's result (index, success,
+                  output_path, error) as soon as that image finishes
     
     Returns:
         Dictionary with the result of meme generation
     """
-    # Create the agent
-    agent = create_meme_generator_agent()
+    # Get the shared agent
+    agent = get_meme_generator_agent()
     
     # Create the initial state
     initial_state = create_initial_state(story)
     
     # Create a unique thread ID for this story generation session
-    thread_id = f"meme_gen_{datetime.now().strftime('%Y%m%d%H%M%S')}"
-    
-    # Run the agent with checkpoint configuration
-    result = agent.invoke(
-        {
-            "story": story,
-            "messages": initial_state["messages"],
-            "meme_prompts": [],
-            "image_paths": [],
-            "metadata": initial_state["metadata"],
-            "status": "in_progress",
-            "error": None
-        },
-        {"configurable": {"thread_id": thread_id}}
-    )
+    # (the suffix keeps runs started in the same second from sharing checkpoints)
+    thread_id = f"meme_gen_{datetime.now().strftime('%Y%m%d%H%M%S')}_{uuid.uuid4().hex[:8]}"
+    
+    # Stream the run with checkpoint configuration: "custom" events carry per-image
+    # progress from generate_meme_images, and the last "values" event is the final state.
+    # The image session scopes one output folder to this run, shared by all of its
+    # bulk image calls and separate from concurrent runs.
+    result: Dict[str, Any] = {}
+    try:
+        with get_image_service().session():
+            async for mode, chunk in agent.astream(
+                initial_state,
+                {"configurable": {"thread_id": thread_id}},
+                stream_mode=["custom", "values"]
+            ):
+                if mode == "values":
+                    result = chunk
+                elif on_image and "image_result" in chunk:
+                    on_image(chunk["image_result"])
+    except StoryAnalysisError as e:
+        result = {**result, "status": "error", "error": str(e)}
     
     return {
-        "success": result["status"] == "complete",
+        "success": result.get("status") == "complete",
         "error": result.get("error"),
         "image_paths": result.get("image_paths", []),
         "session_dir": result.get("metadata", {}).get("session_dir"),
@@ -443,6 +485,25 @@ def generate_memes_from_story(story: str) -> Dict[str, Any]:
     }
 
 
+def generate_memes_from_story(story: str,
+                              on_image: Optional[Callable[[Dict[str, Any]], None]] = None) -> Dict[str, Any]:
+    """
+    Generate a sequence of memes from a story.
+    
+    Synchronous wrapper around agenerate_memes_from_story() for callers without
+    an event loop, such as the CLI.
+    
+    Args:
+        story: The story to convert into memes
+        on_image: Optional callback invoked with each image's result (index, success,
+                  output_path, error) as soon as that image finishes
+    
+    Returns:
+        Dictionary with the result of meme generation
+    """
+    return asyncio.run(agenerate_memes_from_story(story, on_image=on_image))
+
+
 if __name__ == "__main__":
     # Example usage
     story = """
@@ -0,0 +1,3 @@
+"""
+Pytest configuration: makes the project root importable from tests/.
+"""
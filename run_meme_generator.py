@@ -6,6 +6,8 @@ Allows users to generate meme sequences from stories provided via command line o
 
 import os
 import argparse
+import asyncio
+import importlib.util
 import sys
 from pathlib import Path
 from dotenv import load_dotenv
@@ -13,11 +15,10 @@ from dotenv import load_dotenv
 # Load environment variables from .env file
 load_dotenv()
 
-# Make sure required packages are available
-try:
-    import langchain_openai
-    import langgraph
-except ImportError:
+# Make sure required packages are available. find_spec only locates them; the
+# heavy agent imports are deferred until after argument parsing so --help and
+# input errors return immediately.
+if not all(importlib.util.find_spec(name) for name in ("langchain_openai", "langgraph")):
     print("Error: Required packages are missing. Please run:")
     print("    pip install langchain-openai langgraph")
     sys.exit(1)
@@ -25,7 +26,113 @@ except ImportError:
 # Add the project root to the Python path
 sys.path.insert(0, str(Path(__file__).parent))
 
-from agent import generate_memes_from_story
+
+def make_image_reporter(label=""):
+    """
+    Create a callback that prints each meme as soon as it finishes.
+    
+    Args:
+        label: Optional prefix identifying the story when several run at once
+    
+    Returns:
+        Callback for the on_image argument of the meme generator
+    """
+    def report_image(image_result):
+        # Called as each image finishes, so progress shows up before the whole batch is done
+        if image_result["success"]:
+            print(f"  🖼️ {label}Meme {image_result['index'] + 1} ready: {image_result['output_path']}")
+        else:
+            print(f"  ⚠️ {label}Meme {image_result['index'] + 1} failed: {image_result['error']}")
+    return report_image
+
+
+async def generate_all(stories):
+    """
+    Generate memes for several stories concurrently.
+    
+    Args:
+        stories: List of (name, story text) tuples
+    
+    Returns:
+        List of results in the same order as the stories. A story that raised gets
+        a failed result, so it does not discard the other stories' results.
+    """
+    from agent import agenerate_memes_from_story
+    
+    outcomes = await asyncio.gather(*(
+        agenerate_memes_from_story(text, on_image=make_image_reporter(f"[{name}] "))
+        for name, text in stories
+    ), return_exceptions=True)
+    
+    return [
+        {"success": False, "error": f"{type(outcome).__name__}: {outcome}"}
+        if isinstance(outcome, BaseException) else outcome
+        for outcome in outcomes
+    ]
+
+
+def display_memes(image_paths):
+    """
+    Show up to 9 generated memes in a 3x3 grid.
+    
+    Args:
+        image_paths: Paths of the generated meme images
+    """
+    try:
+        from concurrent.futures import ThreadPoolExecutor
+        from PIL import Image
+        import matplotlib.pyplot as plt
+        
+        def load_image(path):
+            # Force the decode here so zlib runs on the worker thread
+            img = Image.open(path)
+            img.load()
+            return img
+        
+        print("\n🖼️ Displaying images...")
+        fig, axes = plt.subplots(3, 3, figsize=(15, 15))
+        axes = axes.flatten()
+        
+        # Decode the PNGs in parallel; PIL releases the GIL while decoding
+        paths = image_paths[:9]  # Limit to 9 images for the grid
+        with ThreadPoolExecutor(max_workers=9) as executor:
+            images = list(executor.map(load_image, paths))
+        
+        for i, img in enumerate(images):
+            axes[i].imshow(img)
+            axes[i].set_title(f"Meme {i+1}")
+            axes[i].axis("off")
+        
+        plt.tight_layout()
+        plt.show()
+    except ImportError:
+        print("Could not display images. Please install PIL and matplotlib:")
+        print("pip install pillow matplotlib")
+
+
+def print_result(result, display=False):
+    """
+    Print the outcome of one story's meme generation.
+    
+    Args:
+        result: Result dictionary from the meme generator agent
+        display: Whether to display the generated memes
+    """
+    if result["success"]:
+        num_images = len(result["image_paths"])
+        print(f"✅ Successfully generated {num_images} meme images!")
+        print(f"📁 Images saved in: {result['session_dir']}")
+        
+        # List the generated images
+        print("\n📊 Generated memes:")
+        for i, path in enumerate(result["image_paths"]):
+            print(f"  {i+1}. {Path(path).name}")
+        
+        # Display images if requested
+        if display:
+            display_memes(result["image_paths"])
+    else:
+        print(f"❌ Failed to generate memes: {result['error']}")
 
 
 def main():
@@ -38,6 +145,8 @@ def main():
     input_group = parser.add_mutually_exclusive_group(required=True)
     input_group.add_argument("--story", "-s", type=str, help="Story text to convert into memes")
     input_group.add_argument("--file", "-f", type=str, help="Path to a text file containing the story")
+    input_group.add_argument("--file-dir", "-F", type=str,
+                             help="Directory of .txt story files to convert concurrently")
     
     # Optional arguments
     parser.add_argument("--output", "-o", type=str, help="Custom output directory for generated memes")
@@ -47,6 +156,7 @@ def main():
     
     # Get story text
     story_text = ""
+    stories = []
     if args.story:
         story_text = args.story
     elif args.file:
@@ -56,6 +166,16 @@ def main():
         except Exception as e:
             print(f"Error reading file: {e}")
             sys.exit(1)
+    elif args.file_dir:
+        try:
+            for story_file in sorted(Path(args.file_dir).glob("*.txt")):
+                stories.append((story_file.stem, story_file.read_text(encoding="utf-8")))
+        except Exception as e:
+            print(f"Error reading story directory: {e}")
+            sys.exit(1)
+        if not stories:
+            print(f"Error: No .txt story files found in {args.file_dir}")
+            sys.exit(1)
     
     # Check for OpenAI API key
     if not os.environ.get("OPENAI_API_KEY"):
@@ -63,46 +183,24 @@ def main():
         print("Please set your OpenAI API key in the .env file or as an environment variable.")
         sys.exit(1)
     
-    print("🎬 Generating meme sequence from your story...")
+    if stories:
+        print(f"🎬 Generating meme sequences from {len(stories)} stories concurrently...")
+    else:
+        print("🎬 Generating meme sequence from your story...")
     print("📝 Analyzing narrative structure...")
     
-    # Generate the memes
-    result = generate_memes_from_story(story_text)
-    
-    if result["success"]:
-        num_images = len(result["image_paths"])
-        print(f"✅ Successfully generated {num_images} meme images!")
-        print(f"📁 Images saved in: {result['session_dir']}")
-        
-        # List the generated images
-        print("\n📊 Generated memes:")
-        for i, path in enumerate(result["image_paths"]):
-            print(f"  {i+1}. {Path(path).name}")
-        
-        # Display images if requested
-        if args.display:
-            try:
-                from PIL import Image
-                import matplotlib.pyplot as plt
-                
-                print("\n🖼️ Displaying images...")
-                fig, axes = plt.subplots(3, 3, figsize=(15, 15))
-                axes = axes.flatten()
-                
-                for i, path in enumerate(result["image_paths"]):
-                    if i < 9:  # Limit to 9 images for the grid
-                        img = Image.open(path)
-                        axes[i].imshow(img)
-                        axes[i].set_title(f"Meme {i+1}")
-                        axes[i].axis("off")
-                
-                plt.tight_layout()
-                plt.show()
-            except ImportError:
-                print("Could not display images. Please install PIL and matplotlib:")
-                print("pip install pillow matplotlib")
+    if stories:
+        # Run every story on one event loop so their API calls overlap
+        results = asyncio.run(generate_all(stories))
+        for (name, _), result in zip(stories, results):
+            print(f"\n📖 {name}")
+            print_result(result, display=args.display)
     else:
-        print(f"❌ Failed to generate memes: {result['error']}")
+        from agent import generate_memes_from_story
+        
+        # Generate the memes
+        result = generate_memes_from_story(story_text, on_image=make_image_reporter())
+        print_result(result, display=args.display)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,180 @@
+import math
+import operator
+import os
+import pickle
+import threading
+import time
+from pathlib import Path
+from typing import List, Optional, Sequence, Tuple, Union
+
+from langchain_openai import OpenAIEmbeddings
+
+# Layout of the persisted file; bump when the record format changes
+CACHE_FORMAT_VERSION = 2
+
+# A cached meme: its visual description and caption, before prompt formatting
+MemePair = Tuple[str, str]
+
+
+class SemanticAnalysisCache:
+    """
+    Cache of story analyses looked up by embedding similarity.
+
+    Stories that are textually close (rewordings, whitespace changes, small typo
+    fixes) map to the same meme prompts, so a hit replaces a full chat completion
+    with one embedding request and a similarity scan.
+
+    Entries hold the model's raw (visual, caption) pairs, so changes to how prompts
+    are formatted apply to cached stories too. They expire after ttl seconds, and
+    the whole cache is dropped when the version (the analysis model and
+    instructions that produced the entries) changes. The file is an append-only
+    log of pickled records, so adding an entry writes only that entry.
+    """
+
+    def __init__(self,
+                 cache_path: Union[str, Path] = ".cache/analysis_cache.pkl",
+                 threshold: float = 0.92,
+                 embedding_model: str = "text-embedding-3-small",
+                 version: str = "",
+                 ttl: float = 7 * 24 * 3600):
+        """
+        Initialize the cache, loading any previously persisted entries.
+
+        Args:
+            cache_path: Path of the file the cache is persisted to.
+            threshold: Minimum cosine similarity for a stored story to count as a hit.
+            embedding_model: The OpenAI model used to embed stories.
+            version: Identifies what produced the cached analyses. Entries stored
+                     under a different version (or embedding model) are discarded.
+            ttl: Seconds a cached analysis stays valid.
+        """
+        self.cache_path = Path(cache_path)
+        self.threshold = threshold
+        self.ttl = ttl
+        self.version = f"{embedding_model}:{version}"
+        self.embeddings = OpenAIEmbeddings(model=embedding_model)
+
+        # Parallel lists: unit-length story embeddings, their cached meme pairs and
+        # when each entry was stored
+        self._vectors: List[List[float]] = []
+        self._meme_pairs: List[List[MemePair]] = []
+        self._created: List[float] = []
+        self._lock = threading.Lock()
+
+        self._load()
+
+    def embed(self, story: str) -> List[float]:
+        """
+        Embed a story as a unit-length vector.
+
+        Args:
+            story: The story text to embed.
+
+        Returns:
+            Normalized embedding, so a dot product gives the cosine similarity.
+        """
+        vector = self.embeddings.embed_query(story)
+        norm = math.sqrt(sum(x * x for x in vector)) or 1.0
+        return [x / norm for x in vector]
+
+    def lookup(self, vector: List[float]) -> Optional[List[MemePair]]:
+        """
+        Find the cached meme pairs of the most similar stored story.
+
+        Args:
+            vector: Normalized story embedding from embed().
+
+        Returns:
+            The cached (visual, caption) pairs if the best unexpired match reaches
+            the threshold, otherwise None.
+        """
+        oldest = time.time() - self.ttl
+        with self._lock:
+            best_score, best_index = -1.0, None
+            for i, stored in enumerate(self._vectors):
+                if self._created[i] < oldest:
+                    continue
+                score = sum(map(operator.mul, vector, stored))
+                if score > best_score:
+                    best_score, best_index = score, i
+
+            if best_index is not None and best_score >= self.threshold:
+                return list(self._meme_pairs[best_index])
+            return None
+
+    def add(self, vector: List[float], meme_pairs: Sequence[MemePair]) -> None:
+        """
+        Store the meme pairs for a story and append the entry to the cache file.
+
+        Args:
+            vector: Normalized story embedding from embed().
+            meme_pairs: The (visual, caption) pairs generated for the story.
+        """
+        entry = {"vector": vector, "meme_pairs": [tuple(pair) for pair in meme_pairs],
+                 "created": time.time()}
+        with self._lock:
+            self._append(entry)
+            self._vectors.append(entry["vector"])
+            self._meme_pairs.append(entry["meme_pairs"])
+            self._created.append(entry["created"])
+
+    def _header(self) -> dict:
+        """
+        The first record of the cache file, identifying its format and version.
+        """
+        return {"format": CACHE_FORMAT_VERSION, "version": self.version}
+
+    def _load(self) -> None:
+        """
+        Load persisted entries, starting empty if the file is missing, unreadable or
+        from another version. Expired entries are dropped, and the file is compacted
+        when anything was dropped.
+        """
+        entries, stale = [], False
+        try:
+            with open(self.cache_path, "rb") as f:
+                if pickle.load(f) != self._header():
+                    raise ValueError("cache version changed")
+                end = os.fstat(f.fileno()).st_size
+                while f.tell() < end:
+                    try:
+                        entries.append(pickle.load(f))
+                    except Exception:
+                        # A write interrupted mid-record; keep what came before it
+                        stale = True
+                        break
+        except FileNotFoundError:
+            pass
+        except (OSError, pickle.UnpicklingError, EOFError, ValueError, TypeError):
+            entries, stale = [], True
+
+        oldest = time.time() - self.ttl
+        live = [entry for entry in entries if entry["created"] >= oldest]
+        self._vectors = [entry["vector"] for entry in live]
+        self._meme_pairs = [entry["meme_pairs"] for entry in live]
+        self._created = [entry["created"] for entry in live]
+
+        if stale or len(live) < len(entries):
+            self._rewrite(live)
+
+    def _append(self, entry: dict) -> None:
+        """
+        Append one entry to the cache file, starting the file if needed. Must be
+        called with the lock held.
+        """
+        if not self.cache_path.exists():
+            self._rewrite([])
+        with open(self.cache_path, "ab") as f:
+            pickle.dump(entry, f)
+
+    def _rewrite(self, entries: List[dict]) -> None:
+        """
+        Atomically replace the cache file with the header and the given entries.
+        """
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.cache_path.with_suffix(".tmp")
+        with open(tmp_path, "wb") as f:
+            pickle.dump(self._header(), f)
+            for entry in entries:
+                pickle.dump(entry, f)
+        os.replace(tmp_path, self.cache_path)
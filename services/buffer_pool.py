@@ -0,0 +1,71 @@
+import threading
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Sequence
+
+
+class BufferPool:
+    """
+    Thread-safe pool of reusable bytearrays in a few fixed size tiers.
+
+    Decoding every generated image into freshly allocated buffers churns several
+    megabytes through the allocator per image. Buffers handed out here are
+    returned on release and reused by the next image of a similar size.
+    """
+
+    def __init__(self, tiers: Sequence[int] = (2 << 20, 8 << 20), max_per_tier: int = 4):
+        """
+        Initialize an empty pool.
+
+        Args:
+            tiers: Buffer sizes in bytes the pool hands out.
+            max_per_tier: Maximum number of idle buffers kept for each tier.
+        """
+        if not tiers:
+            raise ValueError("at least one tier is required")
+        self.tiers = sorted(tiers)
+        self.max_per_tier = max_per_tier
+        self._free: Dict[int, List[bytearray]] = {tier: [] for tier in self.tiers}
+        self._lock = threading.Lock()
+
+    def _tier_for(self, size: int) -> int:
+        """
+        Pick the smallest tier that holds size bytes, capped at the largest tier.
+
+        Args:
+            size: Number of bytes the caller would like to hold.
+
+        Returns:
+            The tier size to hand out
+        """
+        for tier in self.tiers:
+            if size <= tier:
+                return tier
+        return self.tiers[-1]
+
+    @contextmanager
+    def acquire(self, size: int) -> Iterator[bytearray]:
+        """
+        Borrow a buffer for the duration of a with block.
+
+        Requests larger than the largest tier get a buffer of the largest tier, so
+        callers must be prepared to use it as a rolling buffer.
+
+        Args:
+            size: Number of bytes the caller would like to hold.
+
+        Yields:
+            A bytearray of tier size; its previous contents are undefined.
+        """
+        tier = self._tier_for(size)
+        with self._lock:
+            free = self._free[tier]
+            buf = free.pop() if free else None
+        if buf is None:
+            buf = bytearray(tier)
+        try:
+            yield buf
+        finally:
+            with self._lock:
+                free = self._free[tier]
+                if len(free) < self.max_per_tier:
+                    free.append(buf)
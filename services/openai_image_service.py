@@ -1,12 +1,307 @@
+import asyncio
+import atexit
 import base64
+import contextlib
+import contextvars
+import io
+import mimetypes
 import os
+import random
 import concurrent.futures
+import threading
 import time
+import weakref
 from datetime import datetime
 from pathlib import Path
-from typing import List, Optional, Union, Dict, Tuple, Any
+from typing import AsyncGenerator, AsyncIterator, Callable, Iterator, List, Optional, Union, Dict, Tuple, Any
 
-from openai import OpenAI
+import httpx
+import openai
+from openai import AsyncOpenAI, DefaultAsyncHttpxClient, DefaultHttpxClient, OpenAI
+
+try:
+    # SIMD-accelerated decoder; the standard library module is the fallback
+    import pybase64 as _base64
+except ImportError:
+    _base64 = base64
+
+from services.buffer_pool import BufferPool
+from services.rate_limiter import TokenBucket
+
+
+# Attempts per image in bulk operations, and the API statuses worth retrying
+MAX_ATTEMPTS = 3
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+
+# Seconds to serialize requests after the API reports a rate limit (HTTP 429)
+RATE_LIMIT_COOLDOWN = 1.0
+
+
+def _is_retryable(exc: Exception) -> bool:
+    """
+    Check whether an API error is transient and the request should be retried.
+    
+    Rate limits, server errors and dropped connections are retried; other client
+    errors (e.g. a rejected prompt) would fail the same way again.
+    
+    Args:
+        exc: The exception raised by the API call.
+        
+    Returns:
+        True if the request should be retried
+    """
+    if isinstance(exc, openai.APIStatusError):
+        return exc.status_code in RETRYABLE_STATUS_CODES
+    return isinstance(exc, (openai.APIConnectionError, httpx.ReadTimeout))
+
+
+def _retry_delay(attempt: int) -> float:
+    """
+    Exponential backoff with jitter, so retrying workers don't hit the API in lockstep.
+    
+    Args:
+        attempt: Zero-based number of the attempt that just failed.
+        
+    Returns:
+        Seconds to wait before the next attempt
+    """
+    return 2 ** attempt + random.random() * 0.25
+
+
+# Most images one generation request may ask for with n; identical prompts in a
+# bulk call are grouped into requests of up to this many images
+MAX_IMAGES_PER_REQUEST = 10
+
+# Models only accepting n=1 per generation request
+SINGLE_IMAGE_MODELS = {"dall-e-3"}
+
+
+def _group_prompts(prompts: List[str], model: str) -> List[Tuple[str, List[int]]]:
+    """
+    Group the indices of identical prompts so each group is one API request.
+    
+    Args:
+        prompts: The prompts of a bulk call.
+        model: The model the images are generated with.
+    
+    Returns:
+        (prompt, indices) pairs in order of each group's first prompt
+    """
+    max_group = 1 if model in SINGLE_IMAGE_MODELS else MAX_IMAGES_PER_REQUEST
+    open_groups: Dict[str, List[int]] = {}
+    groups = []
+    for i, prompt in enumerate(prompts):
+        indices = open_groups.get(prompt)
+        if indices is None or len(indices) >= max_group:
+            indices = open_groups[prompt] = []
+            groups.append((prompt, indices))
+        indices.append(i)
+    return groups
+
+
+def _group_results(indices: List[int],
+                   output_paths: List[str],
+                   images_base64: List[str]) -> List[Dict[str, Any]]:
+    """
+    Pair the images of a grouped request with the indices they were requested for.
+    
+    Args:
+        indices: Prompt indices of the group.
+        output_paths: Output path for each index.
+        images_base64: Images returned by the API, possibly fewer than requested.
+    
+    Returns:
+        One result dictionary per index; successful ones carry the image_base64 payload
+    """
+    results = []
+    for i, (index, output_path) in enumerate(zip(indices, output_paths)):
+        if i < len(images_base64):
+            results.append({
+                "index": index,
+                "success": True,
+                "output_path": output_path,
+                "error": None,
+                "image_base64": images_base64[i]
+            })
+        else:
+            results.append({
+                "index": index,
+                "success": False,
+                "output_path": None,
+                "error": f"API returned {len(images_base64)} of {len(indices)} requested images"
+            })
+    return results
+
+
+# Size of the base64 slices decoded at a time when saving an image. Must be a
+# multiple of 4 so every slice decodes independently.
+B64_CHUNK_SIZE = 64 * 1024
+
+# Reusable decode buffers shared by every save. Typical generated PNGs fit the
+# 2 or 8 MiB tier whole and are written with a single syscall.
+_BUFFER_POOL = BufferPool(tiers=(2 << 20, 8 << 20))
+
+
+def _write_all(fd: int, data: memoryview) -> None:
+    """
+    Write a buffer to a file descriptor, continuing after partial writes.
+    
+    Args:
+        fd: Open file descriptor to write to.
+        data: Data to write.
+    """
+    while data:
+        data = data[os.write(fd, data):]
+
+
+def _open_image(path: str) -> io.FileIO:
+    """
+    Open a source image unbuffered for upload.
+    
+    httpx reads the upload straight from the file in chunks, and sizes the
+    multipart body from fstat so the request carries a Content-Length. Without a
+    buffered reader in between, each chunk is read with one syscall and no copy.
+    
+    Args:
+        path: Path of the image file.
+    
+    Returns:
+        Unbuffered binary file object positioned at the start
+    """
+    image = open(path, "rb", buffering=0)
+    # The whole file is read front to back once, so ask for early readahead
+    if hasattr(os, "posix_fadvise"):
+        os.posix_fadvise(image.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+    return image
+
+
+@contextlib.contextmanager
+def _opened_images(image_paths: List[str]) -> Iterator[List[Tuple[str, io.FileIO, str]]]:
+    """
+    Open source images for upload, closing them when the block exits.
+    
+    Args:
+        image_paths: Paths of the image files.
+    
+    Yields:
+        A (filename, content, mime type) upload tuple per image
+    """
+    opened = []
+    try:
+        images = []
+        for path in image_paths:
+            opened.append(_open_image(path))
+            mime_type = mimetypes.guess_type(path)[0] or "image/png"
+            images.append((os.path.basename(path), opened[-1], mime_type))
+        yield images
+    finally:
+        for image in opened:
+            image.close()
+
+
+# Worker pools shared by every service instance, keyed by worker count. They are
+# created on first use and live until interpreter exit, so bulk calls reuse warm
+# threads instead of spawning a new pool each time.
+_DEFAULT_EXECUTORS: Dict[int, concurrent.futures.ThreadPoolExecutor] = {}
+_DEFAULT_EXECUTORS_LOCK = threading.Lock()
+
+# Disk writes are milliseconds against seconds per API call, so a couple of
+# writer threads keep up with a full pool of API workers
+WRITER_WORKERS = 2
+_WRITER_EXECUTOR: Optional[concurrent.futures.ThreadPoolExecutor] = None
+
+
+def _shutdown_default_executors() -> None:
+    """
+    Shut down the shared worker pools at interpreter exit.
+    """
+    global _WRITER_EXECUTOR
+    with _DEFAULT_EXECUTORS_LOCK:
+        for executor in _DEFAULT_EXECUTORS.values():
+            executor.shutdown(wait=False, cancel_futures=True)
+        _DEFAULT_EXECUTORS.clear()
+        if _WRITER_EXECUTOR is not None:
+            # Let pending image writes finish so no file is left half written
+            _WRITER_EXECUTOR.shutdown(wait=True)
+            _WRITER_EXECUTOR = None
+
+
+atexit.register(_shutdown_default_executors)
+
+
+def _get_writer_executor() -> concurrent.futures.ThreadPoolExecutor:
+    """
+    Get the shared pool that writes generated images to disk, creating it if needed.
+    
+    Writes are handed off here so API workers can start their next request while
+    the previous image is still being decoded and written.
+    
+    Returns:
+        The shared writer ThreadPoolExecutor
+    """
+    global _WRITER_EXECUTOR
+    with _DEFAULT_EXECUTORS_LOCK:
+        if _WRITER_EXECUTOR is None:
+            _WRITER_EXECUTOR = concurrent.futures.ThreadPoolExecutor(
+                max_workers=WRITER_WORKERS,
+                thread_name_prefix="img-writer"
+            )
+        return _WRITER_EXECUTOR
+
+
+def _get_default_executor(max_workers: int) -> concurrent.futures.ThreadPoolExecutor:
+    """
+    Get the shared worker pool with the given number of threads, creating it if needed.
+    
+    Args:
+        max_workers: Number of worker threads in the pool.
+        
+    Returns:
+        The shared ThreadPoolExecutor
+    """
+    with _DEFAULT_EXECUTORS_LOCK:
+        executor = _DEFAULT_EXECUTORS.get(max_workers)
+        if executor is None:
+            executor = concurrent.futures.ThreadPoolExecutor(
+                max_workers=max_workers,
+                thread_name_prefix="oai-img"
+            )
+            _DEFAULT_EXECUTORS[max_workers] = executor
+        return executor
+
+
+class _Session:
+    """
+    The output directory shared by the bulk calls of one run, created on first use.
+    """
+    
+    def __init__(self):
+        """
+        Start a session whose directory has not been created yet.
+        """
+        self.directory: Optional[Path] = None
+
+
+class _LoopResources:
+    """
+    The async client and concurrency primitives owned by one event loop.
+    """
+    
+    def __init__(self, client: AsyncOpenAI, max_workers: int):
+        """
+        Create the primitives for the running event loop.
+        
+        Args:
+            client: The AsyncOpenAI client created for the loop.
+            max_workers: Maximum number of in-flight requests on the loop.
+        """
+        self.client = client
+        self.semaphore = asyncio.Semaphore(max_workers)
+        self.throttle_lock = asyncio.Lock()
+        # Async generator that warms the client's pool and closes it at loop shutdown,
+        # and the task that runs it up to its yield
+        self.lifetime: Optional[AsyncGenerator[None, None]] = None
+        self.warmup: Optional[asyncio.Future] = None
 
 
 class OpenAIImageService:
@@ -14,21 +309,287 @@ class OpenAIImageService:
     Service for interacting with OpenAI's image generation and editing APIs.
     """
     
-    def __init__(self, api_key: Optional[str] = None, max_workers: int = 10):
+    def __init__(self,
+                 api_key: Optional[str] = None,
+                 max_workers: int = 10,
+                 executor: Optional[concurrent.futures.ThreadPoolExecutor] = None,
+                 requests_per_second: Optional[float] = None):
         """
         Initialize the OpenAI client with an API key.
         
         Args:
             api_key: OpenAI API key. If not provided, it will be read from the OPENAI_API_KEY environment variable.
             max_workers: Maximum number of parallel workers for bulk operations, default is 10.
+                         Also bounds in-flight requests: sync calls on all threads share one
+                         cap of max_workers, and each event loop has its own separate cap.
+            executor: Optional thread pool to run bulk operations on. If not provided, a
+                      long-lived pool of max_workers threads shared across instances is used.
+                      A custom executor is owned by the caller and is not shut down by close().
+            requests_per_second: Optional cap on how many image requests start per second.
+                                 If not provided, it is read from the OPENAI_IMAGES_RPS
+                                 environment variable; unset means no rate cap.
         """
-        self.client = OpenAI(api_key=api_key)
+        self.api_key = api_key
         self.max_workers = min(max_workers, 10)  # Cap at 10 workers
+        self.executor = executor or _get_default_executor(self.max_workers)
+        
+        # Client-side limits so concurrent bulk calls don't trigger 429 storms
+        if requests_per_second is None and os.environ.get("OPENAI_IMAGES_RPS"):
+            requests_per_second = float(os.environ["OPENAI_IMAGES_RPS"])
+        self._rate_limiter = TokenBucket(requests_per_second) if requests_per_second else None
+        self._semaphore = threading.BoundedSemaphore(self.max_workers)
+        self._throttle_lock = threading.Lock()
+        self._throttled_until = 0.0
+        
+        # Output directories already created by this instance, so repeated saves
+        # into the same directory skip the makedirs stat calls
+        self._ensured_dirs: set = set()
+        self._ensured_dirs_lock = threading.Lock()
+        # Next free file number per (directory, file prefix), so bulk calls that
+        # share a session directory don't overwrite each other's images
+        self._next_file_number: Dict[Tuple[str, str], int] = {}
+        
+        # Session of the run in progress (see session()). A context variable keeps
+        # concurrent runs (threads, asyncio tasks) in separate directories, while the
+        # context copies made within one run still share its session object.
+        self._session: contextvars.ContextVar[Optional[_Session]] = contextvars.ContextVar(
+            f"image_session_{id(self)}", default=None
+        )
+        self._session_lock = threading.Lock()
+        
+        self.http_client = DefaultHttpxClient(**self._http_client_options())
+        # max_retries=0: the MAX_ATTEMPTS loops below are the only retry policy, so a
+        # failing request is not retried by the SDK as well (up to 9 real attempts)
+        self.client = OpenAI(api_key=api_key, http_client=self.http_client, max_retries=0)
+        
+        # Open the connection in the background so the first real request
+        # doesn't pay the TCP + TLS handshake
+        threading.Thread(target=self._prewarm_connection, daemon=True).start()
+        
+        # Async clients and their concurrency primitives, one set per event loop,
+        # created on first use inside that loop (see _loop_resources). Entries go
+        # away with their loop, so concurrent loops never share or close each
+        # other's clients.
+        self._loops: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, _LoopResources]" = (
+            weakref.WeakKeyDictionary()
+        )
+        self._loops_lock = threading.Lock()
+    
+    def _http_client_options(self) -> Dict[str, Any]:
+        """
+        Connection pool settings shared by the sync and async HTTP clients.
+        
+        The keep-alive pool is sized to the worker count so every in-flight request
+        (bounded by max_workers on both paths) reuses a warm connection, and HTTP/2
+        lets them multiplex over a single TLS session.
+        
+        Returns:
+            Keyword arguments for DefaultHttpxClient / DefaultAsyncHttpxClient
+        """
+        return {
+            "limits": httpx.Limits(
+                max_connections=self.max_workers,
+                max_keepalive_connections=self.max_workers,
+                keepalive_expiry=60
+            ),
+            "http2": True,
+            "timeout": httpx.Timeout(120.0, connect=5.0)
+        }
+    
+    def _prewarm_connection(self) -> None:
+        """
+        Establish a pooled connection to the API host with a cheap HEAD request.
+        """
+        try:
+            self.http_client.head(str(self.client.base_url))
+        except httpx.HTTPError:
+            # Pre-warming is best effort; the first real request will connect instead
+            pass
+    
+    async def _aprewarm_connection(self, client: AsyncOpenAI) -> None:
+        """
+        Async counterpart of _prewarm_connection for a newly created async client.
+        
+        Args:
+            client: The async client whose connection pool should be warmed.
+        """
+        try:
+            await client._client.head(str(client.base_url))
+        except httpx.HTTPError:
+            # Pre-warming is best effort; the first real request will connect instead
+            pass
+    
+    async def _async_client_lifetime(self, resources: _LoopResources) -> AsyncGenerator[None, None]:
+        """
+        Warm an event loop's async client, then release it when the loop shuts down.
+        
+        This suspends at its yield for the rest of the loop's life. asyncio.run (like
+        any loop that calls shutdown_asyncgens) closes pending async generators before
+        closing the loop, so the finally block runs while the client's connections can
+        still be shut down cleanly.
+        
+        Args:
+            resources: The running loop's async client and primitives.
+        """
+        try:
+            await self._aprewarm_connection(resources.client)
+            yield
+        finally:
+            await self._release_loop_resources(resources)
+    
+    def close(self) -> None:
+        """
+        Close the underlying HTTP connection pools.
+        
+        The sync client is closed, along with the async clients of event loops that
+        are not currently running. Running loops close their own client when they
+        shut down.
+        """
+        self.client.close()
+        with self._loops_lock:
+            loops = list(self._loops.items())
+        for loop, resources in loops:
+            if not loop.is_closed() and not loop.is_running():
+                loop.run_until_complete(self._close_loop_resources(resources))
+    
+    async def aclose(self) -> None:
+        """
+        Close the async HTTP connection pool of the running event loop.
+        
+        Not needed with asyncio.run, which closes it on shutdown; use this for loops
+        that are closed without shutting down their async generators. The next async
+        call on the loop creates a fresh client.
+        """
+        with self._loops_lock:
+            resources = self._loops.get(asyncio.get_running_loop())
+        if resources is not None:
+            await self._close_loop_resources(resources)
+    
+    async def _close_loop_resources(self, resources: _LoopResources) -> None:
+        """
+        Finish the running loop's lifetime generator and release its resources.
+        
+        Args:
+            resources: The loop's async client and primitives.
+        """
+        if not resources.warmup.done():
+            # The generator can't be closed while the warm-up is still running it
+            resources.warmup.cancel()
+            await asyncio.wait([resources.warmup])
+        await resources.lifetime.aclose()
+        # The generator's finally block is skipped if it was cancelled before its
+        # first step, so release explicitly; closing a client twice is harmless
+        await self._release_loop_resources(resources)
+    
+    async def _release_loop_resources(self, resources: _LoopResources) -> None:
+        """
+        Forget the running loop's async resources and close its client.
+        
+        Args:
+            resources: The loop's async client and primitives.
+        """
+        loop = asyncio.get_running_loop()
+        with self._loops_lock:
+            if self._loops.get(loop) is resources:
+                del self._loops[loop]
+        await resources.client.close()
+    
+    def _loop_resources(self) -> _LoopResources:
+        """
+        Get the async client and concurrency primitives of the running event loop.
+        
+        Pooled async connections and asyncio primitives belong to the loop they were
+        created on, so each loop gets its own set, created on first use and kept until
+        the loop shuts down (bulk runs on it reuse warm connections).
+        
+        Returns:
+            The running loop's resources
+        """
+        loop = asyncio.get_running_loop()
+        with self._loops_lock:
+            resources = self._loops.get(loop)
+            if resources is None:
+                # Drop the resources of loops that were closed without shutting down
+                # their async generators; their connections went away with the loop
+                for stale in [other for other in self._loops if other.is_closed()]:
+                    del self._loops[stale]
+                resources = _LoopResources(
+                    AsyncOpenAI(
+                        api_key=self.api_key,
+                        http_client=DefaultAsyncHttpxClient(**self._http_client_options()),
+                        max_retries=0
+                    ),
+                    self.max_workers
+                )
+                # Run the lifetime generator up to its yield; from its first step the
+                # loop tracks it and finalizes it at shutdown
+                resources.lifetime = self._async_client_lifetime(resources)
+                resources.warmup = asyncio.ensure_future(resources.lifetime.__anext__())
+                self._loops[loop] = resources
+        return resources
+    
+    @property
+    def async_client(self) -> AsyncOpenAI:
+        """
+        The AsyncOpenAI client for the running event loop.
+        
+        Returns:
+            AsyncOpenAI client bound to the current event loop
+        """
+        return self._loop_resources().client
+    
+    @contextlib.contextmanager
+    def _api_slot(self) -> Iterator[None]:
+        """
+        Hold one of the service's request slots for the duration of an API call.
+        
+        Bounds in-flight sync requests to max_workers, applies the optional requests
+        per second cap, and lets only one request through at a time for a short
+        cooldown after the API reports a rate limit. The cooldown is checked when a
+        request takes its slot, so requests already past that point are not held back.
+        """
+        with self._semaphore:
+            if self._rate_limiter:
+                self._rate_limiter.acquire()
+            if time.monotonic() < self._throttled_until:
+                with self._throttle_lock:
+                    yield
+            else:
+                yield
+    
+    @contextlib.asynccontextmanager
+    async def _aapi_slot(self) -> AsyncIterator[None]:
+        """
+        Async counterpart of _api_slot for requests made on the event loop.
+        
+        The in-flight cap is per event loop and separate from the sync one; the rate
+        cap and the 429 cooldown are shared with every other caller of the service.
+        """
+        resources = self._loop_resources()
+        async with resources.semaphore:
+            if self._rate_limiter:
+                await self._rate_limiter.aacquire()
+            if time.monotonic() < self._throttled_until:
+                async with resources.throttle_lock:
+                    yield
+            else:
+                yield
+    
+    def _record_failure(self, exc: Exception) -> None:
+        """
+        Start the rate limit cooldown if the API rejected a request with HTTP 429.
+        
+        Args:
+            exc: The exception raised by the API call.
+        """
+        if isinstance(exc, openai.APIStatusError) and exc.status_code == 429:
+            self._throttled_until = time.monotonic() + RATE_LIMIT_COOLDOWN
     
     def generate_image(self, 
                       prompt: str, 
                       model: str = "gpt-image-1", 
-                      output_path: Optional[str] = None) -> Union[str, bytes]:
+                      output_path: Optional[str] = None,
+                      skip_mkdir: bool = False) -> Union[str, bytes]:
         """
         Generate an image from a text prompt.
         
@@ -38,35 +599,181 @@ class OpenAIImageService:
             output_path: Optional path to save the generated image. If provided, the image
                          will be saved to this path and the path will be returned.
                          If not provided, the image bytes will be returned.
+            skip_mkdir: Set when the caller has already created the output directory,
+                        to skip the per-image directory check.
+        
+        Returns:
+            If output_path is provided, returns the path where the image was saved.
+            Otherwise, returns the raw image bytes.
+        """
+        image_base64 = self._request_image(prompt=prompt, model=model)
+        
+        if output_path:
+            self._save_b64_image(image_base64, output_path, skip_mkdir=skip_mkdir)
+            return output_path
+        
+        return _base64.b64decode(image_base64, validate=False)
+    
+    async def agenerate_image(self,
+                              prompt: str,
+                              model: str = "gpt-image-1",
+                              output_path: Optional[str] = None,
+                              skip_mkdir: bool = False) -> Union[str, bytes]:
+        """
+        Asynchronously generate an image from a text prompt.
+        
+        Args:
+            prompt: The text description of the image to generate.
+            model: The OpenAI model to use for image generation.
+            output_path: Optional path to save the generated image. If provided, the image
+                         will be saved to this path and the path will be returned.
+                         If not provided, the image bytes will be returned.
+            skip_mkdir: Set when the caller has already created the output directory,
+                        to skip the per-image directory check.
         
         Returns:
             If output_path is provided, returns the path where the image was saved.
             Otherwise, returns the raw image bytes.
         """
+        image_base64 = await self._arequest_image(prompt=prompt, model=model)
+        
+        if output_path:
+            # Write off the event loop so other in-flight requests keep progressing
+            await asyncio.to_thread(self._save_b64_image, image_base64, output_path, skip_mkdir)
+            return output_path
+        
+        return _base64.b64decode(image_base64, validate=False)
+    
+    def _request_image(self, prompt: str, model: str) -> str:
+        """
+        Request an image from the generation API.
+        
+        Args:
+            prompt: The text description of the image to generate.
+            model: The OpenAI model to use for image generation.
+        
+        Returns:
+            The base64-encoded image
+        """
+        return self._request_images(prompt=prompt, model=model)[0]
+    
+    def _request_images(self, prompt: str, model: str, n: int = 1) -> List[str]:
+        """
+        Request one or more images for the same prompt in a single API call.
+        
+        Args:
+            prompt: The text description of the images to generate.
+            model: The OpenAI model to use for image generation.
+            n: Number of images to generate.
+        
+        Returns:
+            The base64-encoded images. The API may return fewer than n.
+        """
+        # Only send n when needed, for models that reject the parameter
+        extra = {"n": n} if n > 1 else {}
         result = self.client.images.generate(
             model=model,
-            prompt=prompt
+            prompt=prompt,
+            **extra
         )
+        return [image.b64_json for image in result.data]
+    
+    async def _arequest_image(self, prompt: str, model: str) -> str:
+        """
+        Asynchronously request an image from the generation API.
         
-        image_base64 = result.data[0].b64_json
-        image_bytes = base64.b64decode(image_base64)
+        Args:
+            prompt: The text description of the image to generate.
+            model: The OpenAI model to use for image generation.
         
-        if output_path:
-            # Ensure the directory exists
-            os.makedirs(os.path.dirname(output_path), exist_ok=True)
-            
-            # Save the image to the specified path
-            with open(output_path, "wb") as f:
-                f.write(image_bytes)
-            return output_path
+        Returns:
+            The base64-encoded image
+        """
+        return (await self._arequest_images(prompt=prompt, model=model))[0]
+    
+    async def _arequest_images(self, prompt: str, model: str, n: int = 1) -> List[str]:
+        """
+        Asynchronously request one or more images for the same prompt in a single API call.
         
-        return image_bytes
+        Args:
+            prompt: The text description of the images to generate.
+            model: The OpenAI model to use for image generation.
+            n: Number of images to generate.
+        
+        Returns:
+            The base64-encoded images. The API may return fewer than n.
+        """
+        # Only send n when needed, for models that reject the parameter
+        extra = {"n": n} if n > 1 else {}
+        result = await self.async_client.images.generate(
+            model=model,
+            prompt=prompt,
+            **extra
+        )
+        return [image.b64_json for image in result.data]
+    
+    def _ensure_dir(self, directory: str) -> None:
+        """
+        Create a directory once per instance, skipping it on later calls.
+        
+        Args:
+            directory: The directory to create. An empty string means the current
+                       directory and is left alone.
+        """
+        if not directory or directory in self._ensured_dirs:
+            return
+        with self._ensured_dirs_lock:
+            if directory not in self._ensured_dirs:
+                os.makedirs(directory, exist_ok=True)
+                self._ensured_dirs.add(directory)
+    
+    def _save_b64_image(self, image_base64: str, output_path: str, skip_mkdir: bool = False) -> None:
+        """
+        Decode a base64 image to disk, creating the parent directory if needed.
+        
+        The payload is decoded in B64_CHUNK_SIZE slices into a buffer borrowed from
+        the shared pool, which is flushed to an unbuffered descriptor whenever it
+        fills. Images that fit the buffer are written in one syscall, and no
+        per-image decode buffers are allocated.
+        
+        Args:
+            image_base64: The base64-encoded image returned by the API.
+            output_path: Path where the image should be written.
+            skip_mkdir: Set when the caller has already created the parent directory.
+        """
+        # Ensure the directory exists
+        if not skip_mkdir:
+            self._ensure_dir(os.path.dirname(output_path))
+        
+        # Save the image to the specified path
+        fd = os.open(output_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0), 0o644)
+        try:
+            decoded_size = len(image_base64) // 4 * 3
+            with _BUFFER_POOL.acquire(decoded_size) as buf:
+                view = memoryview(buf)
+                filled = 0
+                try:
+                    for start in range(0, len(image_base64), B64_CHUNK_SIZE):
+                        chunk = _base64.b64decode(image_base64[start:start + B64_CHUNK_SIZE], validate=False)
+                        if filled + len(chunk) > len(buf):
+                            _write_all(fd, view[:filled])
+                            filled = 0
+                        view[filled:filled + len(chunk)] = chunk
+                        filled += len(chunk)
+                    if filled:
+                        _write_all(fd, view[:filled])
+                finally:
+                    # Release the export so the buffer can be resized or reused safely
+                    view.release()
+        finally:
+            os.close(fd)
     
     def edit_image(self, 
                   prompt: str, 
                   image_paths: List[str], 
                   model: str = "gpt-image-1",
-                  output_path: Optional[str] = None) -> Union[str, bytes]:
+                  output_path: Optional[str] = None,
+                  skip_mkdir: bool = False) -> Union[str, bytes]:
         """
         Edit or combine multiple images based on a text prompt.
         
@@ -77,40 +784,179 @@ class OpenAIImageService:
             output_path: Optional path to save the edited image. If provided, the image
                          will be saved to this path and the path will be returned.
                          If not provided, the image bytes will be returned.
+            skip_mkdir: Set when the caller has already created the output directory,
+                        to skip the per-image directory check.
         
         Returns:
             If output_path is provided, returns the path where the image was saved.
             Otherwise, returns the raw image bytes.
         """
-        # Open all image files
-        images = [open(path, "rb") for path in image_paths]
+        image_base64 = self._request_edit(prompt=prompt, image_paths=image_paths, model=model)
         
-        try:
+        if output_path:
+            self._save_b64_image(image_base64, output_path, skip_mkdir=skip_mkdir)
+            return output_path
+        
+        return _base64.b64decode(image_base64, validate=False)
+    
+    def _request_edit(self, prompt: str, image_paths: List[str], model: str = "gpt-image-1") -> str:
+        """
+        Request an edited image from the editing API.
+        
+        Args:
+            prompt: The text description of how to edit/combine the images.
+            image_paths: List of paths to the images to use as base for editing.
+            model: The OpenAI model to use for image editing.
+        
+        Returns:
+            The base64-encoded image
+        """
+        with _opened_images(image_paths) as images:
             result = self.client.images.edit(
                 model=model,
                 image=images,
                 prompt=prompt
             )
-            
-            image_base64 = result.data[0].b64_json
-            image_bytes = base64.b64decode(image_base64)
-            
-            if output_path:
-                # Ensure the directory exists
-                os.makedirs(os.path.dirname(output_path), exist_ok=True)
+            return result.data[0].b64_json
+    
+    async def _arequest_edit(self, prompt: str, image_paths: List[str], model: str = "gpt-image-1") -> str:
+        """
+        Asynchronously request an edited image from the editing API.
+        
+        Args:
+            prompt: The text description of how to edit/combine the images.
+            image_paths: List of paths to the images to use as base for editing.
+            model: The OpenAI model to use for image editing.
+        
+        Returns:
+            The base64-encoded image
+        """
+        with _opened_images(image_paths) as images:
+            result = await self.async_client.images.edit(
+                model=model,
+                image=images,
+                prompt=prompt
+            )
+            return result.data[0].b64_json
+    
+    async def aedit_image(self,
+                          prompt: str,
+                          image_paths: List[str],
+                          model: str = "gpt-image-1",
+                          output_path: Optional[str] = None,
+                          skip_mkdir: bool = False) -> Union[str, bytes]:
+        """
+        Asynchronously edit or combine images based on a text prompt.
+        
+        Args:
+            prompt: The text description of how to edit/combine the images.
+            image_paths: List of paths to the images to use as base for editing.
+            model: The OpenAI model to use for image editing.
+            output_path: Optional path to save the edited image. If provided, the image
+                         will be saved to this path and the path will be returned.
+                         If not provided, the image bytes will be returned.
+            skip_mkdir: Set when the caller has already created the output directory,
+                        to skip the per-image directory check.
+        
+        Returns:
+            If output_path is provided, returns the path where the image was saved.
+            Otherwise, returns the raw image bytes.
+        """
+        image_base64 = await self._arequest_edit(prompt=prompt, image_paths=image_paths, model=model)
+        
+        if output_path:
+            # Write off the event loop so other in-flight requests keep progressing
+            await asyncio.to_thread(self._save_b64_image, image_base64, output_path, skip_mkdir)
+            return output_path
+        
+        return _base64.b64decode(image_base64, validate=False)
                 
-                # Save the image to the specified path
-                with open(output_path, "wb") as f:
-                    f.write(image_bytes)
-                return output_path
-            
-            return image_bytes
+    @contextlib.contextmanager
+    def session(self) -> Iterator[None]:
+        """
+        Share one session directory across the bulk calls made inside the block.
         
+        Wrap one run in it, e.g. one agent invocation. Every bulk call in the block
+        without an output_dir saves into the same directory, including calls made
+        from copied contexts such as asyncio tasks or ToolNode's tool calls. The
+        directory is created by the first call that needs it.
+        """
+        token = self._session.set(_Session())
+        try:
+            yield
         finally:
-            # Close all opened files
-            for img in images:
-                img.close()
-                
+            self._session.reset(token)
+    
+    def session_directory(self) -> Path:
+        """
+        Get the directory a bulk call without an output_dir saves into.
+        
+        Inside session() this is the run's shared directory, created on first use.
+        Outside a session every call gets a new directory of its own.
+        
+        Returns:
+            Path object for the session directory
+        """
+        session = self._session.get()
+        if session is None:
+            return self._new_session_directory()
+        with self._session_lock:
+            if session.directory is None:
+                session.directory = self._new_session_directory()
+            return session.directory
+    
+    def _new_session_directory(self) -> Path:
+        """
+        Create a session directory and remember that it exists.
+        
+        Returns:
+            Path object for the new session directory
+        """
+        session_dir = self._generate_session_directory()
+        with self._ensured_dirs_lock:
+            self._ensured_dirs.add(str(session_dir))
+        return session_dir
+    
+    def _resolve_output_dir(self, output_dir: Optional[Path]) -> Path:
+        """
+        Get the directory a bulk call saves into, making sure it exists.
+        
+        The session directory is created by session_directory(), so only a
+        caller-supplied directory may still need creating.
+        
+        Args:
+            output_dir: Optional custom directory passed to the bulk call.
+        
+        Returns:
+            Path object for the output directory
+        """
+        if not output_dir:
+            return self.session_directory()
+        self._ensure_dir(str(output_dir))
+        return output_dir
+    
+    def _reserve_file_numbers(self, directory: Path, prefix: str, count: int) -> int:
+        """
+        Reserve a contiguous block of file numbers for a bulk call's output files.
+        
+        Numbering continues across calls that save into the same directory, so the
+        second bulk call of a run writes image_003.png onwards instead of
+        overwriting the first call's image_000.png.
+        
+        Args:
+            directory: Directory the files are saved in.
+            prefix: File name prefix, e.g. "image" or "edited_image".
+            count: Number of files the call will write.
+        
+        Returns:
+            The first reserved number; file i of the call uses start + i.
+        """
+        key = (str(directory), prefix)
+        with self._ensured_dirs_lock:
+            start = self._next_file_number.get(key, 0)
+            self._next_file_number[key] = start + count
+        return start
+    
     def _generate_session_directory(self) -> Path:
         """
         Generate a timestamped directory for storing a batch of images.
@@ -120,62 +966,142 @@ class OpenAIImageService:
         """
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         session_dir = Path(f"generated_images/session_{timestamp}")
-        session_dir.mkdir(parents=True, exist_ok=True)
-        return session_dir
+        session_dir.parent.mkdir(parents=True, exist_ok=True)
+        
+        # Concurrent runs can start in the same second; mkdir is atomic, so add a
+        # suffix until we get a directory of our own
+        suffix = 1
+        while True:
+            try:
+                session_dir.mkdir()
+                return session_dir
+            except FileExistsError:
+                session_dir = Path(f"generated_images/session_{timestamp}_{suffix}")
+                suffix += 1
     
-    def _worker_generate_image(self, args: Tuple[str, str, int, str]) -> Dict[str, Any]:
+    def _worker_generate_image(self, args: Tuple[str, str, List[int], List[str]]) -> List[Dict[str, Any]]:
         """
-        Worker function to generate a single image in parallel processing.
+        Worker function to request a group of images for one prompt in parallel processing.
         
         Args:
-            args: Tuple containing (prompt, model, index, output_path)
+            args: Tuple containing (prompt, model, indices, output_paths). All images of
+                  the group come from a single request with n=len(indices).
             
         Returns:
-            Dictionary with operation results
+            List of dictionaries with operation results, one per index. Successful
+            ones also carry the image_base64 payload, which the caller writes to
+            output_path.
         """
-        prompt, model, index, output_path = args
-        try:
-            result = self.generate_image(prompt=prompt, model=model, output_path=output_path)
-            return {
-                "index": index,
-                "success": True,
-                "output_path": output_path,
-                "error": None
-            }
-        except Exception as e:
-            return {
-                "index": index,
-                "success": False,
-                "output_path": None,
-                "error": str(e)
-            }
+        prompt, model, indices, output_paths = args
+        for attempt in range(MAX_ATTEMPTS):
+            try:
+                with self._api_slot():
+                    images_base64 = self._request_images(prompt=prompt, model=model, n=len(indices))
+                return _group_results(indices, output_paths, images_base64)
+            except Exception as e:
+                self._record_failure(e)
+                # Back off and retry transient failures; only the final error is reported
+                if attempt < MAX_ATTEMPTS - 1 and _is_retryable(e):
+                    time.sleep(_retry_delay(attempt))
+                    continue
+                return [{
+                    "index": index,
+                    "success": False,
+                    "output_path": None,
+                    "error": str(e)
+                } for index in indices]
     
-    def _worker_edit_image(self, args: Tuple[str, List[str], int, str]) -> Dict[str, Any]:
+    def _worker_edit_image(self, args: Tuple[str, List[str], List[int], List[str]]) -> List[Dict[str, Any]]:
         """
-        Worker function to edit a single image in parallel processing.
+        Worker function to request a single image edit in parallel processing.
         
         Args:
-            args: Tuple containing (prompt, image_paths, index, output_path)
+            args: Tuple containing (prompt, image_paths, [index], [output_path])
             
         Returns:
-            Dictionary with operation results
+            List holding the dictionary with operation results. On success it also
+            carries the image_base64 payload, which the caller writes to output_path.
         """
-        prompt, image_paths, index, output_path = args
-        try:
-            result = self.edit_image(prompt=prompt, image_paths=image_paths, output_path=output_path)
-            return {
-                "index": index,
-                "success": True,
-                "output_path": output_path,
-                "error": None
-            }
-        except Exception as e:
-            return {
-                "index": index,
-                "success": False,
-                "output_path": None,
-                "error": str(e)
-            }
+        prompt, image_paths, (index,), (output_path,) = args
+        for attempt in range(MAX_ATTEMPTS):
+            try:
+                with self._api_slot():
+                    image_base64 = self._request_edit(prompt=prompt, image_paths=image_paths)
+                return [{
+                    "index": index,
+                    "success": True,
+                    "output_path": output_path,
+                    "error": None,
+                    "image_base64": image_base64
+                }]
+            except Exception as e:
+                self._record_failure(e)
+                # Back off and retry transient failures; only the final error is reported
+                if attempt < MAX_ATTEMPTS - 1 and _is_retryable(e):
+                    time.sleep(_retry_delay(attempt))
+                    continue
+                return [{
+                    "index": index,
+                    "success": False,
+                    "output_path": None,
+                    "error": str(e)
+                }]
+    
+    def _run_bulk(self,
+                  worker: Callable[[Tuple], List[Dict[str, Any]]],
+                  tasks: List[Tuple]) -> List[Dict[str, Any]]:
+        """
+        Run bulk worker tasks as a two-stage pipeline: API requests, then disk writes.
+        
+        API workers only fetch the image payload; each finished payload is handed
+        to the writer pool, so its write overlaps the next API calls instead of
+        sitting on the worker's critical path.
+        
+        Args:
+            worker: Worker function taking a task tuple whose indices are at position 2
+                    and output paths at position 3, returning one result per index.
+            tasks: Task tuples to execute.
+            
+        Returns:
+            List of dictionaries containing operation results, ordered by index.
+        """
+        # Indices are dense 0..N-1, so each result goes straight into its slot
+        results: List[Dict[str, Any]] = [None] * sum(len(task[2]) for task in tasks)
+        writer = _get_writer_executor()
+        pending_writes = {}
+        
+        # Execute tasks in parallel on the long-lived worker pool
+        future_to_task = {self.executor.submit(worker, task): task for task in tasks}
+        
+        # Process results as they complete, queueing each image's write immediately
+        for future in concurrent.futures.as_completed(future_to_task):
+            try:
+                task_results = future.result()
+            except Exception as exc:
+                task = future_to_task[future]
+                indices = task[2]  # Indices are at position 2 in the task tuple
+                task_results = [{
+                    "index": index,
+                    "success": False,
+                    "output_path": None,
+                    "error": str(exc)
+                } for index in indices]
+            
+            for result in task_results:
+                image_base64 = result.pop("image_base64", None)
+                if result["success"]:
+                    write = writer.submit(self._save_b64_image, image_base64, result["output_path"], True)
+                    pending_writes[write] = result
+                results[result["index"]] = result
+        
+        # Wait for all writes; a failed write fails that image
+        for write, result in pending_writes.items():
+            try:
+                write.result()
+            except Exception as exc:
+                result.update({"success": False, "output_path": None, "error": str(exc)})
+        
+        return results
     
     def bulk_generate_images(self, 
                            prompts: List[str], 
@@ -184,50 +1110,112 @@ class OpenAIImageService:
         """
         Generate multiple images in parallel from a list of prompts.
         
+        Identical prompts are grouped into a single request for several images
+        (up to MAX_IMAGES_PER_REQUEST), so repeats cost one round trip.
+        
         Args:
             prompts: List of text descriptions for the images to generate.
             model: The OpenAI model to use for image generation.
             output_dir: Optional custom directory to save images. If not provided,
-                        a timestamped session directory will be created.
+                        the current run's session directory is used.
                         
         Returns:
             List of dictionaries containing operation results for each prompt.
         """
-        # Create a session directory if not provided
-        session_dir = output_dir if output_dir else self._generate_session_directory()
-        session_dir.mkdir(parents=True, exist_ok=True)
+        # Use the run's session directory if not provided
+        session_dir = self._resolve_output_dir(output_dir)
         
-        results = []
+        start = self._reserve_file_numbers(session_dir, "image", len(prompts))
         
-        # Prepare tasks for parallel execution
+        # Prepare tasks for parallel execution, one request per group of identical prompts
         tasks = []
-        for i, prompt in enumerate(prompts):
-            # Create a filename with index for proper ordering
-            output_path = str(session_dir / f"image_{i:03d}.png")
-            tasks.append((prompt, model, i, output_path))
+        for prompt, indices in _group_prompts(prompts, model):
+            # Create filenames with index for proper ordering
+            output_paths = [str(session_dir / f"image_{start + i:03d}.png") for i in indices]
+            tasks.append((prompt, model, indices, output_paths))
         
-        # Execute tasks in parallel with a maximum number of workers
-        with concurrent.futures.ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-            # Submit all tasks and collect futures
-            future_to_task = {executor.submit(self._worker_generate_image, task): task for task in tasks}
-            
-            # Process results as they complete
-            for future in concurrent.futures.as_completed(future_to_task):
+        return self._run_bulk(self._worker_generate_image, tasks)
+    
+    async def abulk_generate_images(self,
+                                    prompts: List[str],
+                                    model: str = "gpt-image-1",
+                                    output_dir: Optional[Path] = None,
+                                    on_result: Optional[Callable[[Dict[str, Any]], None]] = None) -> List[Dict[str, Any]]:
+        """
+        Asynchronously generate multiple images concurrently from a list of prompts.
+        
+        All requests are issued at once on the event loop, bounded by the service's
+        max_workers in-flight requests (shared by concurrent bulk calls on the same loop),
+        so wall time tracks the slowest request rather than the sum of all of them.
+        Identical prompts are grouped into a single request for several images.
+        
+        Args:
+            prompts: List of text descriptions for the images to generate.
+            model: The OpenAI model to use for image generation.
+            output_dir: Optional custom directory to save images. If not provided,
+                        the current run's session directory is used.
+            on_result: Optional callback invoked with each result dictionary as soon as
+                       that image finishes, in completion order.
+                        
+        Returns:
+            List of dictionaries containing operation results for each prompt.
+        """
+        # Use the run's session directory if not provided
+        session_dir = self._resolve_output_dir(output_dir)
+        start = self._reserve_file_numbers(session_dir, "image", len(prompts))
+        
+        loop = asyncio.get_running_loop()
+        writer = _get_writer_executor()
+        
+        async def save_one(result: Dict[str, Any]) -> Dict[str, Any]:
+            image_base64 = result.pop("image_base64", None)
+            if not result["success"]:
+                return result
+            try:
+                await loop.run_in_executor(writer, self._save_b64_image, image_base64,
+                                           result["output_path"], True)
+            except Exception as e:
+                result.update({"success": False, "output_path": None, "error": str(e)})
+            return result
+        
+        async def generate_group(prompt: str, indices: List[int]) -> List[Dict[str, Any]]:
+            output_paths = [str(session_dir / f"image_{start + i:03d}.png") for i in indices]
+            for attempt in range(MAX_ATTEMPTS):
                 try:
-                    result = future.result()
-                    results.append(result)
-                except Exception as exc:
-                    task = future_to_task[future]
-                    index = task[2]  # Index is at position 2 in the task tuple
-                    results.append({
+                    async with self._aapi_slot():
+                        images_base64 = await self._arequest_images(prompt=prompt, model=model,
+                                                                    n=len(indices))
+                    break
+                except Exception as e:
+                    self._record_failure(e)
+                    # Back off outside the request slot so other requests can use it
+                    if attempt < MAX_ATTEMPTS - 1 and _is_retryable(e):
+                        await asyncio.sleep(_retry_delay(attempt))
+                        continue
+                    return [{
                         "index": index,
                         "success": False,
                         "output_path": None,
-                        "error": str(exc)
-                    })
+                        "error": str(e)
+                    } for index in indices]
+            
+            # The request slot is already released, so the next API call starts
+            # while these images are written on the writer pool
+            return await asyncio.gather(
+                *(save_one(result) for result in _group_results(indices, output_paths, images_base64))
+            )
+        
+        results: List[Dict[str, Any]] = [None] * len(prompts)
+        
+        # Report each image as soon as it is written rather than after the whole batch
+        for next_group in asyncio.as_completed(
+            [generate_group(prompt, indices) for prompt, indices in _group_prompts(prompts, model)]
+        ):
+            for result in await next_group:
+                results[result["index"]] = result
+                if on_result:
+                    on_result(result)
         
-        # Sort results by index for consistent ordering
-        results.sort(key=lambda x: x["index"])
         return results
     
     def bulk_edit_images(self,
@@ -243,7 +1231,7 @@ class OpenAIImageService:
             image_paths_list: List of lists, where each inner list contains paths to images to edit/combine.
             model: The OpenAI model to use for image editing.
             output_dir: Optional custom directory to save images. If not provided,
-                        a timestamped session directory will be created.
+                        the current run's session directory is used.
                         
         Returns:
             List of dictionaries containing operation results for each set of images.
@@ -251,39 +1239,101 @@ class OpenAIImageService:
         if len(prompts) != len(image_paths_list):
             raise ValueError("Number of prompts must match number of image path lists")
         
-        # Create a session directory if not provided
-        session_dir = output_dir if output_dir else self._generate_session_directory()
-        session_dir.mkdir(parents=True, exist_ok=True)
+        # Use the run's session directory if not provided
+        session_dir = self._resolve_output_dir(output_dir)
         
-        results = []
+        start = self._reserve_file_numbers(session_dir, "edited_image", len(prompts))
         
         # Prepare tasks for parallel execution
         tasks = []
         for i, (prompt, img_paths) in enumerate(zip(prompts, image_paths_list)):
             # Create a filename with index for proper ordering
-            output_path = str(session_dir / f"edited_image_{i:03d}.png")
-            tasks.append((prompt, img_paths, i, output_path))
+            output_path = str(session_dir / f"edited_image_{start + i:03d}.png")
+            tasks.append((prompt, img_paths, [i], [output_path]))
         
-        # Execute tasks in parallel with a maximum number of workers
-        with concurrent.futures.ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-            # Submit all tasks and collect futures
-            future_to_task = {executor.submit(self._worker_edit_image, task): task for task in tasks}
-            
-            # Process results as they complete
-            for future in concurrent.futures.as_completed(future_to_task):
+        return self._run_bulk(self._worker_edit_image, tasks)
+    
+    async def abulk_edit_images(self,
+                                prompts: List[str],
+                                image_paths_list: List[List[str]],
+                                model: str = "gpt-image-1",
+                                output_dir: Optional[Path] = None,
+                                on_result: Optional[Callable[[Dict[str, Any]], None]] = None) -> List[Dict[str, Any]]:
+        """
+        Asynchronously edit multiple sets of images concurrently based on prompts.
+        
+        All requests are issued at once on the event loop, bounded by the service's
+        max_workers in-flight requests like abulk_generate_images.
+        
+        Args:
+            prompts: List of text descriptions for the image edits.
+            image_paths_list: List of lists, where each inner list contains paths to images to edit/combine.
+            model: The OpenAI model to use for image editing.
+            output_dir: Optional custom directory to save images. If not provided,
+                        the current run's session directory is used.
+            on_result: Optional callback invoked with each result dictionary as soon as
+                       that image finishes, in completion order.
+                        
+        Returns:
+            List of dictionaries containing operation results for each set of images.
+        """
+        if len(prompts) != len(image_paths_list):
+            raise ValueError("Number of prompts must match number of image path lists")
+        
+        # Use the run's session directory if not provided
+        session_dir = self._resolve_output_dir(output_dir)
+        start = self._reserve_file_numbers(session_dir, "edited_image", len(prompts))
+        
+        loop = asyncio.get_running_loop()
+        writer = _get_writer_executor()
+        
+        async def edit_one(index: int, prompt: str, image_paths: List[str]) -> Dict[str, Any]:
+            output_path = str(session_dir / f"edited_image_{start + index:03d}.png")
+            for attempt in range(MAX_ATTEMPTS):
                 try:
-                    result = future.result()
-                    results.append(result)
-                except Exception as exc:
-                    task = future_to_task[future]
-                    index = task[2]  # Index is at position 2 in the task tuple
-                    results.append({
+                    async with self._aapi_slot():
+                        image_base64 = await self._arequest_edit(prompt=prompt, image_paths=image_paths,
+                                                                 model=model)
+                    break
+                except Exception as e:
+                    self._record_failure(e)
+                    # Back off outside the request slot so other requests can use it
+                    if attempt < MAX_ATTEMPTS - 1 and _is_retryable(e):
+                        await asyncio.sleep(_retry_delay(attempt))
+                        continue
+                    return {
                         "index": index,
                         "success": False,
                         "output_path": None,
-                        "error": str(exc)
-                    })
+                        "error": str(e)
+                    }
+            
+            # Write on the writer pool after releasing the request slot
+            try:
+                await loop.run_in_executor(writer, self._save_b64_image, image_base64, output_path, True)
+            except Exception as e:
+                return {
+                    "index": index,
+                    "success": False,
+                    "output_path": None,
+                    "error": str(e)
+                }
+            return {
+                "index": index,
+                "success": True,
+                "output_path": output_path,
+                "error": None
+            }
+        
+        results: List[Dict[str, Any]] = [None] * len(prompts)
+        
+        # Report each image as soon as it is written rather than after the whole batch
+        for next_result in asyncio.as_completed(
+            [edit_one(i, prompt, paths) for i, (prompt, paths) in enumerate(zip(prompts, image_paths_list))]
+        ):
+            result = await next_result
+            results[result["index"]] = result
+            if on_result:
+                on_result(result)
         
-        # Sort results by index for consistent ordering
-        results.sort(key=lambda x: x["index"])
         return results
@@ -0,0 +1,60 @@
+import asyncio
+import threading
+import time
+from typing import Optional
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket limiting how many requests start per second.
+
+    Each acquire reserves a token, going into debt when the bucket is empty, and
+    waits until that token would have been refilled. Callers are therefore spaced
+    out at the configured rate instead of all retrying at once.
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        """
+        Initialize a full bucket.
+
+        Args:
+            rate: Tokens added per second, i.e. the sustained requests per second.
+            capacity: Maximum burst size. Defaults to one second's worth of tokens.
+        """
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self._tokens = self.capacity
+        self._last_refill = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _reserve(self) -> float:
+        """
+        Take one token from the bucket.
+
+        Returns:
+            Seconds the caller must wait before its token is available
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._last_refill) * self.rate)
+            self._last_refill = now
+            self._tokens -= 1
+            return 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+
+    def acquire(self) -> None:
+        """
+        Block the calling thread until a token is available.
+        """
+        wait = self._reserve()
+        if wait > 0:
+            time.sleep(wait)
+
+    async def aacquire(self) -> None:
+        """
+        Wait on the event loop until a token is available.
+        """
+        wait = self._reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
@@ -0,0 +1,66 @@
+import asyncio
+import sqlite3
+from typing import Any, AsyncIterator, Dict, Optional, Sequence, Tuple
+
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import ChannelVersions, Checkpoint, CheckpointMetadata, CheckpointTuple
+from langgraph.checkpoint.sqlite import SqliteSaver
+
+
+class ThreadedSqliteSaver(SqliteSaver):
+    """
+    SqliteSaver that can also be used from async graph runs.
+
+    SqliteSaver only implements the sync checkpointer interface, while the meme
+    generator graph runs through ainvoke. The async methods delegate to the sync
+    ones on a worker thread; SqliteSaver already serializes access to the shared
+    connection with its own lock.
+    """
+
+    async def aget_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        return await asyncio.to_thread(self.get_tuple, config)
+
+    async def alist(self,
+                    config: Optional[RunnableConfig],
+                    *,
+                    filter: Optional[Dict[str, Any]] = None,
+                    before: Optional[RunnableConfig] = None,
+                    limit: Optional[int] = None) -> AsyncIterator[CheckpointTuple]:
+        checkpoints = await asyncio.to_thread(
+            lambda: list(self.list(config, filter=filter, before=before, limit=limit))
+        )
+        for checkpoint in checkpoints:
+            yield checkpoint
+
+    async def aput(self,
+                   config: RunnableConfig,
+                   checkpoint: Checkpoint,
+                   metadata: CheckpointMetadata,
+                   new_versions: ChannelVersions) -> RunnableConfig:
+        return await asyncio.to_thread(self.put, config, checkpoint, metadata, new_versions)
+
+    async def aput_writes(self,
+                          config: RunnableConfig,
+                          writes: Sequence[Tuple[str, Any]],
+                          task_id: str,
+                          task_path: str = "") -> None:
+        await asyncio.to_thread(self.put_writes, config, writes, task_id, task_path)
+
+
+def create_sqlite_checkpointer(db_path: str = ".langgraph.db") -> ThreadedSqliteSaver:
+    """
+    Create a checkpointer backed by a SQLite database in WAL mode.
+
+    WAL lets several processes (parallel CLI runs, server workers) read and write
+    the same checkpoint database concurrently, so a run interrupted after the
+    story analysis can be resumed from its thread_id in any process.
+
+    Args:
+        db_path: Path of the SQLite database file.
+
+    Returns:
+        Checkpointer to pass to StateGraph.compile
+    """
+    conn = sqlite3.connect(db_path, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    return ThreadedSqliteSaver(conn)
@@ -0,0 +1,39 @@
+"""
+Shared fixtures for the image service tests. API calls are replaced with canned
+payloads, so no network access or API key is needed.
+"""
+
+import base64
+
+import pytest
+
+from services.openai_image_service import OpenAIImageService
+
+PNG_B64 = base64.b64encode(b"\x89PNG\r\n\x1a\nfake image").decode()
+
+
+@pytest.fixture
+def service(tmp_path, monkeypatch):
+    # Session directories are created under ./generated_images
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(OpenAIImageService, "_prewarm_connection", lambda self: None)
+    monkeypatch.setattr(OpenAIImageService, "_request_images",
+                        lambda self, prompt, model, n=1: [PNG_B64] * n)
+    monkeypatch.setattr(OpenAIImageService, "_request_edit",
+                        lambda self, prompt, image_paths, model="gpt-image-1": PNG_B64)
+
+    async def aprewarm_connection(self, client):
+        return None
+
+    async def arequest_images(self, prompt, model, n=1):
+        return [PNG_B64] * n
+
+    async def arequest_edit(self, prompt, image_paths, model="gpt-image-1"):
+        return PNG_B64
+
+    monkeypatch.setattr(OpenAIImageService, "_aprewarm_connection", aprewarm_connection)
+    monkeypatch.setattr(OpenAIImageService, "_arequest_images", arequest_images)
+    monkeypatch.setattr(OpenAIImageService, "_arequest_edit", arequest_edit)
+    service = OpenAIImageService(api_key="test-key")
+    yield service
+    service.close()
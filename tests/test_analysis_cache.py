@@ -0,0 +1,160 @@
+"""
+Tests for the semantic story analysis cache and how analyze_story uses it.
+"""
+
+import math
+import pickle
+import time
+
+import pytest
+
+import agent
+from services.analysis_cache import SemanticAnalysisCache
+from tools.story_tools import MemePrompt, MemePromptList
+
+PAIRS = [(f"scene {i}", f"caption {i}") for i in range(agent.NUM_MEME_PROMPTS)]
+
+
+def _unit(*components):
+    norm = math.sqrt(sum(x * x for x in components))
+    return [x / norm for x in components]
+
+
+@pytest.fixture
+def make_cache(tmp_path, monkeypatch):
+    # OpenAIEmbeddings needs a key to construct; no embedding request is made
+    monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+    path = tmp_path / "analysis_cache.pkl"
+
+    def make(**kwargs):
+        return SemanticAnalysisCache(cache_path=path, **kwargs)
+    return make
+
+
+def test_lookup_hits_only_at_or_above_threshold(make_cache):
+    cache = make_cache(threshold=0.92)
+    cache.add(_unit(1.0, 0.0), PAIRS)
+
+    # cos = 0.95 and cos = 0.9 against the stored vector
+    assert cache.lookup(_unit(0.95, math.sqrt(1 - 0.95 ** 2))) == PAIRS
+    assert cache.lookup(_unit(0.9, math.sqrt(1 - 0.9 ** 2))) is None
+    assert cache.lookup(_unit(0.0, 1.0)) is None
+
+
+def test_lookup_returns_the_closest_story(make_cache):
+    cache = make_cache(threshold=0.5)
+    other = [("other", "story")] * agent.NUM_MEME_PROMPTS
+    cache.add(_unit(1.0, 0.0), PAIRS)
+    cache.add(_unit(0.0, 1.0), other)
+
+    assert cache.lookup(_unit(0.2, 1.0)) == other
+
+
+def test_entries_persist_across_instances(make_cache):
+    first = make_cache()
+    first.add(_unit(1.0, 0.0), PAIRS)
+    first.add(_unit(0.0, 1.0), PAIRS[:1] * agent.NUM_MEME_PROMPTS)
+
+    second = make_cache()
+    assert second.lookup(_unit(1.0, 0.0)) == PAIRS
+    assert second.lookup(_unit(0.0, 1.0)) == PAIRS[:1] * agent.NUM_MEME_PROMPTS
+
+
+def test_truncated_last_entry_keeps_the_earlier_ones(make_cache):
+    cache = make_cache()
+    cache.add(_unit(1.0, 0.0), PAIRS)
+    cache.add(_unit(0.0, 1.0), PAIRS)
+    data = cache.cache_path.read_bytes()
+    cache.cache_path.write_bytes(data[:-10])
+
+    reloaded = make_cache()
+    assert reloaded.lookup(_unit(1.0, 0.0)) == PAIRS
+    assert reloaded.lookup(_unit(0.0, 1.0)) is None
+    # The file was compacted, so new entries are readable again
+    reloaded.add(_unit(0.0, 1.0), PAIRS)
+    assert make_cache().lookup(_unit(0.0, 1.0)) == PAIRS
+
+
+def test_version_change_discards_entries(make_cache):
+    make_cache(version="v1").add(_unit(1.0, 0.0), PAIRS)
+
+    assert make_cache(version="v1").lookup(_unit(1.0, 0.0)) == PAIRS
+    assert make_cache(version="v2").lookup(_unit(1.0, 0.0)) is None
+    assert make_cache(version="v1", embedding_model="text-embedding-3-large").lookup(_unit(1.0, 0.0)) is None
+
+
+def test_expired_entries_are_ignored_and_dropped(make_cache, monkeypatch):
+    cache = make_cache(ttl=60)
+    cache.add(_unit(1.0, 0.0), PAIRS)
+    assert cache.lookup(_unit(1.0, 0.0)) == PAIRS
+
+    later = time.time() + 61
+    monkeypatch.setattr(time, "time", lambda: later)
+    assert cache.lookup(_unit(1.0, 0.0)) is None
+
+    size = cache.cache_path.stat().st_size
+    assert make_cache(ttl=60).lookup(_unit(1.0, 0.0)) is None
+    assert cache.cache_path.stat().st_size < size
+
+
+def test_legacy_cache_file_is_discarded(make_cache):
+    path = make_cache().cache_path
+    path.write_bytes(pickle.dumps({"vectors": [_unit(1.0, 0.0)], "meme_prompts": [["formatted"]]}))
+
+    assert make_cache().lookup(_unit(1.0, 0.0)) is None
+
+
+class _FakeCache:
+    def __init__(self, cached=None):
+        self.cached = cached
+        self.added = []
+
+    def embed(self, story):
+        return _unit(1.0, 0.0)
+
+    def lookup(self, vector):
+        return self.cached
+
+    def add(self, vector, pairs):
+        self.added.append(pairs)
+
+
+def _state():
+    return agent.create_initial_state("A developer fixes a bug.")
+
+
+def _response(count):
+    return MemePromptList(prompts=[MemePrompt(visual=v, caption=c) for v, c in PAIRS[:count]])
+
+
+def test_analyze_story_caches_raw_pairs_and_formats_them(monkeypatch):
+    cache = _FakeCache()
+    monkeypatch.setattr(agent, "get_analysis_cache", lambda: cache)
+    monkeypatch.setattr(agent, "request_meme_prompts", lambda messages: _response(agent.NUM_MEME_PROMPTS))
+
+    update = agent.analyze_story(_state())
+
+    assert cache.added == [PAIRS]
+    assert update["meme_prompts"] == [agent.format_prompt(v, c) for v, c in PAIRS]
+
+
+def test_analyze_story_does_not_cache_incomplete_analyses(monkeypatch):
+    cache = _FakeCache()
+    monkeypatch.setattr(agent, "get_analysis_cache", lambda: cache)
+    monkeypatch.setattr(agent, "request_meme_prompts", lambda messages: _response(3))
+
+    update = agent.analyze_story(_state())
+
+    assert cache.added == []
+    assert len(update["meme_prompts"]) == 3
+
+
+def test_analyze_story_formats_cached_pairs_with_the_current_template(monkeypatch):
+    cache = _FakeCache(cached=PAIRS)
+    monkeypatch.setattr(agent, "get_analysis_cache", lambda: cache)
+    monkeypatch.setattr(agent, "format_prompt", lambda visual, caption: f"new template: {visual}")
+
+    update = agent.analyze_story(_state())
+
+    assert update["meme_prompts"] == [f"new template: {v}" for v, _ in PAIRS]
+    assert update["metadata"]["analysis_cache_hit"] is True
@@ -0,0 +1,72 @@
+"""
+Tests that one image service can be used from several event loops at once.
+"""
+
+import asyncio
+import threading
+from pathlib import Path
+
+from services.openai_image_service import OpenAIImageService
+from tests.conftest import PNG_B64
+
+
+def test_concurrent_loops_keep_their_own_clients(service, monkeypatch):
+    in_flight = {}
+    lock = threading.Lock()
+
+    async def arequest_images(self, prompt, model, n=1):
+        client = self.async_client
+        with lock:
+            in_flight[threading.current_thread().name] = max(
+                in_flight.get(threading.current_thread().name, 0),
+                service.max_workers - self._loop_resources().semaphore._value
+            )
+        await asyncio.sleep(0.02)
+        # Another loop must not have closed or replaced this loop's client meanwhile
+        assert not client.is_closed()
+        assert self.async_client is client
+        return [PNG_B64] * n
+
+    monkeypatch.setattr(OpenAIImageService, "_arequest_images", arequest_images)
+
+    start = threading.Barrier(2)
+    outcomes = {}
+    clients = {}
+
+    def run(name):
+        async def generate():
+            clients[name] = service.async_client
+            start.wait()
+            return await service.abulk_generate_images([f"{name} {i}" for i in range(12)],
+                                                       output_dir=Path(name))
+        try:
+            outcomes[name] = asyncio.run(generate())
+        except BaseException as exc:
+            outcomes[name] = exc
+
+    threads = [threading.Thread(target=run, args=(name,), name=name) for name in ("first", "second")]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    for name in ("first", "second"):
+        results = outcomes[name]
+        assert not isinstance(results, BaseException), results
+        assert all(result["success"] for result in results), results
+        assert in_flight[name] <= service.max_workers
+    assert clients["first"] is not clients["second"]
+    # Each loop closed its own client at shutdown and forgot it
+    assert all(client.is_closed() for client in clients.values())
+    assert len(service._loops) == 0
+
+
+def test_aclose_releases_the_running_loops_client(service):
+    async def run():
+        client = service.async_client
+        await service.aclose()
+        return client, service.async_client
+
+    closed, fresh = asyncio.run(run())
+    assert closed.is_closed()
+    assert fresh is not closed
@@ -0,0 +1,115 @@
+"""
+Tests for the image service's retry policy, request grouping, uploads and image writing.
+"""
+
+import base64
+import os
+
+import httpx
+import openai
+import pytest
+
+from services import openai_image_service
+from services.openai_image_service import (
+    MAX_IMAGES_PER_REQUEST,
+    OpenAIImageService,
+    _group_prompts,
+    _is_retryable,
+    _retry_delay,
+)
+
+REQUEST = httpx.Request("POST", "https://api.openai.com/v1/images/generations")
+
+
+def _status_error(status_code):
+    response = httpx.Response(status_code, request=REQUEST)
+    return openai.APIStatusError(f"HTTP {status_code}", response=response, body=None)
+
+
+@pytest.mark.parametrize("status_code", [429, 500, 502, 503, 504])
+def test_transient_statuses_are_retryable(status_code):
+    assert _is_retryable(_status_error(status_code))
+
+
+@pytest.mark.parametrize("status_code", [400, 401, 403, 404])
+def test_client_errors_are_not_retryable(status_code):
+    assert not _is_retryable(_status_error(status_code))
+
+
+def test_connection_failures_are_retryable():
+    assert _is_retryable(openai.APIConnectionError(request=REQUEST))
+    assert _is_retryable(openai.APITimeoutError(request=REQUEST))
+    assert _is_retryable(httpx.ReadTimeout("read timed out", request=REQUEST))
+
+
+def test_other_exceptions_are_not_retryable():
+    assert not _is_retryable(ValueError("bad prompt"))
+    assert not _is_retryable(OSError("disk full"))
+
+
+def test_retry_delay_backs_off_exponentially_with_bounded_jitter(monkeypatch):
+    monkeypatch.setattr(openai_image_service.random, "random", lambda: 0.0)
+    assert [_retry_delay(attempt) for attempt in range(3)] == [1, 2, 4]
+
+    monkeypatch.setattr(openai_image_service.random, "random", lambda: 0.999)
+    assert [_retry_delay(attempt) for attempt in range(3)] == [
+        pytest.approx(1.25, abs=1e-3), pytest.approx(2.25, abs=1e-3), pytest.approx(4.25, abs=1e-3)
+    ]
+
+
+def test_identical_prompts_are_grouped_in_first_seen_order():
+    groups = _group_prompts(["cat", "dog", "cat", "bird", "dog"], "gpt-image-1")
+    assert groups == [("cat", [0, 2]), ("dog", [1, 4]), ("bird", [3])]
+
+
+def test_groups_are_split_at_the_request_limit():
+    groups = _group_prompts(["cat"] * (MAX_IMAGES_PER_REQUEST + 3), "gpt-image-1")
+    assert groups == [
+        ("cat", list(range(MAX_IMAGES_PER_REQUEST))),
+        ("cat", list(range(MAX_IMAGES_PER_REQUEST, MAX_IMAGES_PER_REQUEST + 3))),
+    ]
+
+
+def test_single_image_models_get_one_request_per_prompt():
+    assert _group_prompts(["cat", "cat"], "dall-e-3") == [("cat", [0]), ("cat", [1])]
+
+
+def test_no_prompts_means_no_requests():
+    assert _group_prompts([], "gpt-image-1") == []
+
+
+@pytest.mark.parametrize("size", [0, 1000, 3 << 20, 20 << 20])
+def test_saved_images_match_the_decoded_payload(service, tmp_path, size):
+    # The larger sizes overflow the pooled buffer and are flushed in several writes
+    data = os.urandom(size)
+    output_path = tmp_path / "image.png"
+
+    service._save_b64_image(base64.b64encode(data).decode(), str(output_path))
+
+    assert output_path.read_bytes() == data
+
+
+def test_edit_uploads_are_sent_with_a_content_length(tmp_path, monkeypatch):
+    monkeypatch.setattr(OpenAIImageService, "_prewarm_connection", lambda self: None)
+    sources = []
+    for name in ("first.png", "second.png"):
+        source = tmp_path / name
+        source.write_bytes(os.urandom(50_000))
+        sources.append(str(source))
+    requests = []
+
+    def handler(request):
+        requests.append((request.headers, request.read()))
+        return httpx.Response(200, json={"created": 0, "data": [{"b64_json": "ZWRpdGVk"}]})
+
+    service = OpenAIImageService(api_key="test-key")
+    service.client = openai.OpenAI(api_key="test-key", max_retries=0,
+                                   http_client=httpx.Client(transport=httpx.MockTransport(handler)))
+
+    assert service._request_edit("hats on", sources) == "ZWRpdGVk"
+
+    headers, body = requests[0]
+    assert "transfer-encoding" not in headers
+    assert int(headers["content-length"]) == len(body)
+    for source in sources:
+        assert open(source, "rb").read() in body
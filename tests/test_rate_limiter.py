@@ -0,0 +1,93 @@
+"""
+Tests for the token bucket that caps image requests per second.
+"""
+
+import asyncio
+
+import pytest
+
+from services import rate_limiter
+from services.rate_limiter import TokenBucket
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+        self.sleeps = []
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(rate_limiter.time, "monotonic", clock.monotonic)
+    monkeypatch.setattr(rate_limiter.time, "sleep", clock.sleep)
+    return clock
+
+
+def test_rate_must_be_positive():
+    with pytest.raises(ValueError):
+        TokenBucket(0)
+
+
+def test_capacity_defaults_to_one_second_of_tokens():
+    assert TokenBucket(5).capacity == 5
+    assert TokenBucket(0.5).capacity == 1.0
+
+
+def test_full_bucket_allows_a_burst_then_spaces_callers(clock):
+    bucket = TokenBucket(rate=2, capacity=2)
+
+    bucket.acquire()
+    bucket.acquire()
+    assert clock.sleeps == []
+
+    bucket.acquire()
+    assert clock.sleeps == [pytest.approx(0.5)]
+
+
+def test_waiting_callers_queue_up_in_debt(clock):
+    bucket = TokenBucket(rate=4, capacity=1)
+    bucket._reserve()
+
+    # Without time passing, each further reservation waits one more interval
+    assert bucket._reserve() == pytest.approx(0.25)
+    assert bucket._reserve() == pytest.approx(0.5)
+
+
+def test_tokens_refill_over_time_up_to_capacity(clock):
+    bucket = TokenBucket(rate=2, capacity=2)
+    bucket.acquire()
+    bucket.acquire()
+
+    clock.now += 10
+    bucket.acquire()
+    bucket.acquire()
+    assert clock.sleeps == []
+
+    bucket.acquire()
+    assert clock.sleeps == [pytest.approx(0.5)]
+
+
+def test_aacquire_waits_on_the_event_loop(clock, monkeypatch):
+    waits = []
+
+    async def fake_sleep(seconds):
+        waits.append(seconds)
+
+    monkeypatch.setattr(rate_limiter.asyncio, "sleep", fake_sleep)
+    bucket = TokenBucket(rate=1, capacity=1)
+
+    async def run():
+        await bucket.aacquire()
+        await bucket.aacquire()
+
+    asyncio.run(run())
+    assert waits == [pytest.approx(1.0)]
+    assert clock.sleeps == []
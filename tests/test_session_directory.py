@@ -0,0 +1,94 @@
+"""
+Tests that the bulk calls of one run share a session directory and keep all their files.
+"""
+
+import asyncio
+from pathlib import Path
+
+import pytest
+from langchain_core.messages import AIMessage
+
+from tools import image_tools
+
+
+def _paths(results):
+    return [result["output_path"] for result in results]
+
+
+def test_bulk_calls_in_a_session_share_one_folder_and_keep_all_files(service):
+    with service.session():
+        first = service.bulk_generate_images(["a cat", "a dog", "a cat"])
+        second = service.bulk_generate_images(["a bird", "a fish"])
+
+    paths = _paths(first + second)
+    assert all(result["success"] for result in first + second)
+    assert len(set(paths)) == 5
+    assert all(Path(path).exists() for path in paths)
+    assert len({Path(path).parent for path in paths}) == 1
+
+
+def test_sync_and_async_bulk_calls_in_a_session_keep_all_files(service):
+    async def run():
+        generated = await service.abulk_generate_images(["a bird"])
+        edited = await service.abulk_edit_images(["hats on"], [source_paths])
+        return generated + edited
+
+    with service.session():
+        source_paths = _paths(service.bulk_generate_images(["a cat", "a dog"]))
+        later = asyncio.run(run())
+        edited_again = service.bulk_edit_images(["hats off"], [source_paths])
+
+    paths = source_paths + _paths(later + edited_again)
+    assert all(result["success"] for result in later + edited_again)
+    assert len(set(paths)) == 5
+    assert all(Path(path).exists() for path in paths)
+    assert len({Path(path).parent for path in paths}) == 1
+
+
+def test_bulk_calls_outside_a_session_get_their_own_folders(service):
+    first = service.bulk_generate_images(["a cat"])
+    second = service.bulk_generate_images(["a cat"])
+
+    assert Path(first[0]["output_path"]).parent != Path(second[0]["output_path"]).parent
+
+
+def test_concurrent_sessions_get_separate_folders(service):
+    async def one_run(prompt):
+        with service.session():
+            first = await service.abulk_generate_images([prompt])
+            second = await service.abulk_generate_images([prompt])
+        return {Path(path).parent for path in _paths(first + second)}
+
+    async def main():
+        return await asyncio.gather(one_run("a cat"), one_run("a dog"))
+
+    left, right = asyncio.run(main())
+    assert len(left) == 1 and len(right) == 1
+    assert left != right
+
+
+def _two_bulk_calls():
+    return {"messages": [AIMessage(content="", tool_calls=[
+        {"name": "bulk_generate_images", "args": {"input_data": {"prompts": ["a cat", "a dog"]}},
+         "id": "call_1", "type": "tool_call"},
+        {"name": "bulk_generate_images", "args": {"input_data": {"prompts": ["a bird"]}},
+         "id": "call_2", "type": "tool_call"},
+    ])]}
+
+
+@pytest.mark.parametrize("mode", ["invoke", "ainvoke"])
+def test_tool_node_calls_in_one_step_share_the_session_folder(service, monkeypatch, mode):
+    # ToolNode runs each tool call in its own copy of the context
+    monkeypatch.setattr(image_tools, "get_image_service", lambda: service)
+
+    with service.session():
+        if mode == "invoke":
+            output = image_tools.image_tool_node.invoke(_two_bulk_calls())
+        else:
+            output = asyncio.run(image_tools.image_tool_node.ainvoke(_two_bulk_calls()))
+
+    responses = [message.content for message in output["messages"]]
+    assert all('"success": true' in response for response in responses), responses
+    folders = {response.split('"session_dir": "')[1].split('"')[0] for response in responses}
+    assert len(folders) == 1
+    assert len(list(Path(folders.pop()).iterdir())) == 3
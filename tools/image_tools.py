@@ -2,20 +2,34 @@
 Tools for interacting with the OpenAI Image Generation API through a langgraph agent.
 """
 
+import asyncio
 import os
-import json
+import uuid
+from functools import lru_cache
 from pathlib import Path
-from typing import List, Dict, Any, Optional, TypedDict, Annotated
+from typing import Callable, List, Dict, Any, Optional, TypedDict, Annotated
 
+from langchain_core.tools import InjectedToolArg, StructuredTool
 from langgraph.graph import END
 from langgraph.prebuilt import ToolNode
 from pydantic import BaseModel, Field
 
 from services.openai_image_service import OpenAIImageService
+from tools.tool_utils import get_schema
 
 
-# Initialize the image service once
-image_service = OpenAIImageService()
+@lru_cache(maxsize=1)
+def get_image_service() -> OpenAIImageService:
+    """
+    Get the shared image service, creating it on first use.
+    
+    Creating the service builds the OpenAI clients and reads OPENAI_API_KEY, so
+    it is deferred until a tool actually runs.
+    
+    Returns:
+        The process-wide OpenAIImageService
+    """
+    return OpenAIImageService()
 
 
 # Input models for the tools
@@ -68,10 +82,10 @@ def generate_image(input_data: GenerateImageInput) -> Dict[str, Any]:
     # If no output path is provided, create one
     if not output_path:
         os.makedirs("generated_images", exist_ok=True)
-        output_path = f"generated_images/image_{int(time.time())}.png"
+        output_path = f"generated_images/image_{uuid.uuid4().hex[:12]}.png"
     
     # Generate the image
-    result = image_service.generate_image(
+    result = get_image_service().generate_image(
         prompt=input_data.prompt,
         model=input_data.model,
         output_path=output_path
@@ -98,7 +112,7 @@ def edit_image(input_data: EditImageInput) -> Dict[str, Any]:
     # If no output path is provided, create one
     if not output_path:
         os.makedirs("generated_images", exist_ok=True)
-        output_path = f"generated_images/edited_{int(time.time())}.png"
+        output_path = f"generated_images/edited_{uuid.uuid4().hex[:12]}.png"
     
     # Check if all source images exist
     for path in input_data.image_paths:
@@ -109,7 +123,7 @@ def edit_image(input_data: EditImageInput) -> Dict[str, Any]:
             }
     
     # Edit the images
-    result = image_service.edit_image(
+    result = get_image_service().edit_image(
         prompt=input_data.prompt,
         image_paths=input_data.image_paths,
         model=input_data.model,
@@ -122,81 +136,206 @@ def edit_image(input_data: EditImageInput) -> Dict[str, Any]:
         "message": f"Image edited and saved to {output_path}"
     }
 
-def bulk_generate_images(input_data: BulkGenerateImagesInput) -> Dict[str, Any]:
+async def bulk_generate_images(
+    input_data: BulkGenerateImagesInput,
+    on_result: Annotated[Optional[Callable[[Dict[str, Any]], None]], InjectedToolArg] = None
+) -> Dict[str, Any]:
     """
-    Generate multiple images in parallel from a list of prompts.
+    Generate multiple images concurrently from a list of prompts.
+    
+    The requests are fanned out on the event loop, so this tool must be awaited
+    (e.g. through ``ToolNode.ainvoke`` or an agent's ``ainvoke``).
     
     Args:
         input_data: Parameters for bulk generation including prompts, model, and output directory.
+        on_result: Optional callback receiving each image's result as it completes. Injected
+                   by the caller, so it is not part of the tool schema shown to the model.
         
     Returns:
         Dictionary containing the operation results for all prompts.
     """
     output_dir = input_data.output_dir
     
-    # Convert string path to Path object if provided
-    output_dir_path = Path(output_dir) if output_dir else None
+    # Convert string path to Path object if provided, else use the run's session directory
+    session_dir = Path(output_dir) if output_dir else get_image_service().session_directory()
     
-    # Generate images in bulk
-    results = image_service.bulk_generate_images(
+    # Generate images concurrently
+    results = await get_image_service().abulk_generate_images(
         prompts=input_data.prompts,
         model=input_data.model,
-        output_dir=output_dir_path
+        output_dir=session_dir,
+        on_result=on_result
     )
     
+    return _bulk_response(results, session_dir, "Generated")
+
+
+def _bulk_generate_images_sync(
+    input_data: BulkGenerateImagesInput,
+    on_result: Annotated[Optional[Callable[[Dict[str, Any]], None]], InjectedToolArg] = None
+) -> Dict[str, Any]:
+    """
+    Generate multiple images in parallel from a list of prompts, for sync callers.
+    
+    Backs ``ToolNode.invoke`` in sync graphs using the service's thread pool.
+    
+    Args:
+        input_data: Parameters for bulk generation including prompts, model, and output directory.
+        on_result: Optional callback receiving each image's result once the bulk call finishes.
+        
+    Returns:
+        Dictionary containing the operation results for all prompts.
+    """
+    output_dir = input_data.output_dir
+    
+    # Convert string path to Path object if provided, else use the run's session directory
+    session_dir = Path(output_dir) if output_dir else get_image_service().session_directory()
+    
+    # Generate images in parallel
+    results = get_image_service().bulk_generate_images(
+        prompts=input_data.prompts,
+        model=input_data.model,
+        output_dir=session_dir
+    )
+    if on_result:
+        for result in results:
+            on_result(result)
+    
+    return _bulk_response(results, session_dir, "Generated")
+
+
+def _bulk_response(results: List[Dict[str, Any]], session_dir: Path, verb: str) -> Dict[str, Any]:
+    """
+    Build a bulk tool's response from the per-image results.
+    
+    Args:
+        results: Result dictionaries from the image service, ordered by index.
+        session_dir: Directory the images were saved in.
+        verb: Past-tense verb for the summary message, e.g. "Generated".
+        
+    Returns:
+        Dictionary containing the operation results.
+    """
     # Extract successful paths
     successful_paths = [result["output_path"] for result in results if result["success"]]
     
+    # Surface the first failure so callers can report why the bulk call failed
+    first_error = next((result["error"] for result in results if not result["success"]), None)
+    
     return {
-        "success": all(result["success"] for result in results),
+        "success": first_error is None,
+        "error": first_error,
         "results": results,
         "output_paths": successful_paths,
-        "session_dir": str(output_dir_path) if output_dir_path else str(results[0]["output_path"]).rsplit("/", 1)[0] if results and results[0]["success"] else None,
-        "message": f"Generated {len(successful_paths)} images out of {len(input_data.prompts)} requested"
+        "session_dir": str(session_dir),
+        "message": f"{verb} {len(successful_paths)} images out of {len(results)} requested"
     }
 
-def bulk_edit_images(input_data: BulkEditImagesInput) -> Dict[str, Any]:
+
+def _find_missing_source(image_paths_list: List[List[str]]) -> Optional[str]:
+    """
+    Check that every source image exists.
+    
+    The paths are checked inline and the check stops at the first missing image.
+    A stat takes microseconds, so dispatching them to a thread pool would cost more
+    than it saves, and the image service's pool may be busy with API calls.
+    
+    Args:
+        image_paths_list: Source image paths for each prompt.
+        
+    Returns:
+        An error message naming the first missing image, or None if all exist.
+    """
+    for i, paths in enumerate(image_paths_list):
+        for path in paths:
+            if not os.path.exists(path):
+                return f"Source image not found at prompt index {i}: {path}"
+    return None
+
+
+async def bulk_edit_images(
+    input_data: BulkEditImagesInput,
+    on_result: Annotated[Optional[Callable[[Dict[str, Any]], None]], InjectedToolArg] = None
+) -> Dict[str, Any]:
     """
-    Edit multiple sets of images in parallel based on prompts.
+    Edit multiple sets of images concurrently based on prompts.
+    
+    The requests are fanned out on the event loop, so this tool must be awaited.
     
     Args:
         input_data: Parameters for bulk editing including prompts, source images, model, and output directory.
+        on_result: Optional callback receiving each image's result as it completes. Injected
+                   by the caller, so it is not part of the tool schema shown to the model.
         
     Returns:
         Dictionary containing the operation results for all edits.
     """
+    # Validate that image paths exist, off the event loop
+    error = await asyncio.to_thread(_find_missing_source, input_data.image_paths_list)
+    if error:
+        return {
+            "success": False,
+            "error": error
+        }
+    
     output_dir = input_data.output_dir
     
-    # Convert string path to Path object if provided
-    output_dir_path = Path(output_dir) if output_dir else None
+    # Convert string path to Path object if provided, else use the run's session directory
+    session_dir = Path(output_dir) if output_dir else get_image_service().session_directory()
+    
+    # Edit images concurrently
+    results = await get_image_service().abulk_edit_images(
+        prompts=input_data.prompts,
+        image_paths_list=input_data.image_paths_list,
+        model=input_data.model,
+        output_dir=session_dir,
+        on_result=on_result
+    )
+    
+    return _bulk_response(results, session_dir, "Edited")
+
+
+def _bulk_edit_images_sync(
+    input_data: BulkEditImagesInput,
+    on_result: Annotated[Optional[Callable[[Dict[str, Any]], None]], InjectedToolArg] = None
+) -> Dict[str, Any]:
+    """
+    Edit multiple sets of images in parallel based on prompts, for sync callers.
     
+    Backs ``ToolNode.invoke`` in sync graphs using the service's thread pool.
+    
+    Args:
+        input_data: Parameters for bulk editing including prompts, source images, model, and output directory.
+        on_result: Optional callback receiving each image's result once the bulk call finishes.
+        
+    Returns:
+        Dictionary containing the operation results for all edits.
+    """
     # Validate that image paths exist
-    for i, paths in enumerate(input_data.image_paths_list):
-        for path in paths:
-            if not os.path.exists(path):
-                return {
-                    "success": False,
-                    "error": f"Source image not found at prompt index {i}: {path}"
-                }
+    error = _find_missing_source(input_data.image_paths_list)
+    if error:
+        return {
+            "success": False,
+            "error": error
+        }
+    
+    output_dir = input_data.output_dir
     
-    # Edit images in bulk
-    results = image_service.bulk_edit_images(
+    # Convert string path to Path object if provided, else use the run's session directory
+    session_dir = Path(output_dir) if output_dir else get_image_service().session_directory()
+    
+    # Edit images in parallel
+    results = get_image_service().bulk_edit_images(
         prompts=input_data.prompts,
         image_paths_list=input_data.image_paths_list,
         model=input_data.model,
-        output_dir=output_dir_path
+        output_dir=session_dir
     )
+    if on_result:
+        for result in results:
+            on_result(result)
     
-    # Extract successful paths
-    successful_paths = [result["output_path"] for result in results if result["success"]]
-    
-    return {
-        "success": all(result["success"] for result in results),
-        "results": results,
-        "output_paths": successful_paths,
-        "session_dir": str(output_dir_path) if output_dir_path else str(results[0]["output_path"]).rsplit("/", 1)[0] if results and results[0]["success"] else None,
-        "message": f"Edited {len(successful_paths)} images out of {len(input_data.prompts)} requested"
-    }
+    return _bulk_response(results, session_dir, "Edited")
 
 # Create tool definitions for langgraph
 tools = [
@@ -205,7 +344,7 @@ tools = [
         "function": {
             "name": "generate_image",
             "description": "Generate a single image from a text prompt",
-            "parameters": GenerateImageInput.model_json_schema()
+            "parameters": get_schema(GenerateImageInput)
         }
     },
     {
@@ -213,7 +352,7 @@ tools = [
         "function": {
             "name": "edit_image",
             "description": "Edit or combine multiple images based on a text prompt",
-            "parameters": EditImageInput.model_json_schema()
+            "parameters": get_schema(EditImageInput)
         }
     },
     {
@@ -221,7 +360,7 @@ tools = [
         "function": {
             "name": "bulk_generate_images",
             "description": "Generate multiple images in parallel from a list of prompts",
-            "parameters": BulkGenerateImagesInput.model_json_schema()
+            "parameters": get_schema(BulkGenerateImagesInput)
         }
     },
     {
@@ -229,15 +368,26 @@ tools = [
         "function": {
             "name": "bulk_edit_images",
             "description": "Edit multiple sets of images in parallel based on prompts",
-            "parameters": BulkEditImagesInput.model_json_schema()
+            "parameters": get_schema(BulkEditImagesInput)
         }
     }
 ]
 
-# Create a ToolNode with the image tools
+# Create a ToolNode with the image tools. The bulk tools get sync implementations
+# too, so the node works from both invoke and ainvoke.
 image_tool_node = ToolNode(tools=[
     generate_image,
     edit_image,
-    bulk_generate_images,
-    bulk_edit_images
+    StructuredTool.from_function(
+        func=_bulk_generate_images_sync,
+        coroutine=bulk_generate_images,
+        name="bulk_generate_images",
+        description="Generate multiple images in parallel from a list of prompts"
+    ),
+    StructuredTool.from_function(
+        func=_bulk_edit_images_sync,
+        coroutine=bulk_edit_images,
+        name="bulk_edit_images",
+        description="Edit multiple sets of images in parallel based on prompts"
+    )
 ])
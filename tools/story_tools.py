@@ -3,11 +3,14 @@ Tools for converting stories into meme prompts.
 """
 
 import os
-from typing import List, Dict, Any
+from functools import lru_cache
+from typing import List, Dict, Any, Tuple
 from pydantic import BaseModel, Field
 
 from langgraph.prebuilt import ToolNode
 
+from tools.tool_utils import get_schema
+
 
 class StoryToMemePromptInput(BaseModel):
     """Input for converting a story to meme prompts."""
@@ -17,6 +20,35 @@ class StoryToMemePromptInput(BaseModel):
     word_limit: int = Field(20, description="Maximum number of words per meme text")
 
 
+class MemePrompt(BaseModel):
+    """A single meme in the story sequence."""
+    visual: str = Field(..., description="Detailed description of the visual scene, including style")
+    caption: str = Field(..., description="Short caption (15-20 words maximum) to appear on the meme")
+
+
+class MemePromptList(BaseModel):
+    """Structured model output for a story broken down into memes."""
+    prompts: List[MemePrompt] = Field(..., description="The meme prompts, in story order")
+
+
+# Placeholder text returned by create_meme_prompts for each meme
+PLACEHOLDER_PROMPT_TEMPLATE = "Meme {} prompt would be generated here"
+
+
+@lru_cache(maxsize=32)
+def _placeholder_prompts(num_memes: int) -> Tuple[str, ...]:
+    """
+    Build the placeholder prompts for a meme count once and reuse them.
+    
+    Args:
+        num_memes: Number of placeholder prompts to build.
+        
+    Returns:
+        Immutable tuple of placeholder prompts.
+    """
+    return tuple(PLACEHOLDER_PROMPT_TEMPLATE.format(i + 1) for i in range(num_memes))
+
+
 def create_meme_prompts(input_data: StoryToMemePromptInput) -> Dict[str, Any]:
     """
     Convert a story into a series of meme prompts for image generation.
@@ -34,7 +66,7 @@ def create_meme_prompts(input_data: StoryToMemePromptInput) -> Dict[str, Any]:
     # This is just a placeholder structure
     return {
         "success": True,
-        "prompts": [f"Meme {i+1} prompt would be generated here" for i in range(input_data.num_memes)],
+        "prompts": list(_placeholder_prompts(input_data.num_memes)),
         "story_analysis": "Analysis of the story flow and key moments",
         "message": f"Generated {input_data.num_memes} meme prompts in {input_data.meme_style} style"
     }
@@ -47,7 +79,7 @@ story_tools = [
         "function": {
             "name": "create_meme_prompts",
             "description": "Convert a story into a series of meme prompts for image generation",
-            "parameters": StoryToMemePromptInput.model_json_schema()
+            "parameters": get_schema(StoryToMemePromptInput)
         }
     }
 ]
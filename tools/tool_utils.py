@@ -0,0 +1,25 @@
+"""
+Shared helpers for building langgraph tool definitions.
+"""
+
+from functools import lru_cache
+from typing import Any, Dict, Type
+
+from pydantic import BaseModel
+
+
+@lru_cache(maxsize=None)
+def get_schema(model: Type[BaseModel]) -> Dict[str, Any]:
+    """
+    Get the JSON schema of a tool input model, computing it only once.
+
+    Pydantic rebuilds the schema on every model_json_schema() call, so tool
+    definitions share the cached result. Callers must not mutate it.
+
+    Args:
+        model: The Pydantic model describing the tool input.
+
+    Returns:
+        The model's JSON schema.
+    """
+    return model.model_json_schema()